@@ -1,6 +1,8 @@
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
+from pydantic import BaseModel
 import os
 from dotenv import load_dotenv
 from openai import AsyncOpenAI
@@ -19,47 +21,65 @@ from app.services.compass_orchestrator import CompassOrchestrator
 # Load environment variables
 load_dotenv()
 
-# Global instances
-app_state = {}
-
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
-    app_state["openai_client"] = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-    app_state["redis_client"] = await redis.from_url(
+    app.state.openai_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    # Bounded pool with keepalive so bursts can't exhaust file descriptors
+    redis_pool = redis.ConnectionPool.from_url(
         os.getenv("REDIS_URL", "redis://localhost:6379"),
+        max_connections=int(os.getenv("REDIS_MAX_CONNECTIONS", "64")),
+        socket_timeout=5,
+        socket_keepalive=True,
+        health_check_interval=30,
         decode_responses=True
     )
-    app_state["orchestrator"] = CompassOrchestrator(
-        openai_client=app_state["openai_client"],
-        redis_client=app_state["redis_client"]
+    app.state.redis_pool = redis_pool
+    app.state.redis_client = redis.Redis(connection_pool=redis_pool)
+    app.state.orchestrator = CompassOrchestrator(
+        openai_client=app.state.openai_client,
+        redis_client=app.state.redis_client
     )
-    
+
     yield
-    
+
     # Shutdown
-    await app_state["redis_client"].close()
+    await app.state.redis_client.close()
+    await app.state.redis_pool.disconnect()
 
 # Create FastAPI app
 app = FastAPI(
     title="Compass Module API",
     description="AI-powered career discovery system",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
-# Configure CORS
+# Configure CORS - precomputed once so no per-request parsing or list rebuilds
+CORS_ORIGINS = tuple(os.getenv("CORS_ORIGINS", "http://localhost:3000").split(","))
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=os.getenv("CORS_ORIGINS", "http://localhost:3000").split(","),
+    allow_origins=CORS_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
-# Dependency to get orchestrator
-def get_orchestrator() -> CompassOrchestrator:
-    return app_state["orchestrator"]
+# Dependency to get orchestrator - attribute access on app.state avoids the
+# shared module-global dict pattern that breaks under multi-worker reloads
+def get_orchestrator(request: Request) -> CompassOrchestrator:
+    return request.app.state.orchestrator
+
+# Centralized error translation so route bodies stay on the happy path
+@app.exception_handler(ValueError)
+async def value_error_handler(request, exc: ValueError):
+    return ORJSONResponse({"detail": str(exc)}, status_code=404)
+
+@app.exception_handler(Exception)
+async def unhandled_error_handler(request, exc: Exception):
+    return ORJSONResponse({"detail": str(exc)}, status_code=500)
 
 # Health check
 @app.get("/health")
@@ -74,11 +94,7 @@ async def start_journey(
     orchestrator: CompassOrchestrator = Depends(get_orchestrator)
 ):
     """Start a new Compass journey for a user"""
-    try:
-        journey_state = await orchestrator.start_journey(request)
-        return journey_state
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return await orchestrator.start_journey(request)
 
 @app.get("/api/v1/journey/{journey_id}", response_model=JourneyState)
 async def get_journey(
@@ -97,37 +113,28 @@ async def get_next_question(
     orchestrator: CompassOrchestrator = Depends(get_orchestrator)
 ):
     """Generate the next question for the journey"""
-    try:
-        question = await orchestrator.generate_next_question(journey_id)
-        return question
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return await orchestrator.generate_next_question(journey_id)
+
+class ResponseSubmission(BaseModel):
+    question_id: str
+    response_text: str
+    response_time_seconds: Optional[int] = None
+    skipped: bool = False
 
 @app.post("/api/v1/journey/{journey_id}/respond", response_model=JourneyDecision)
 async def submit_response(
     journey_id: str,
-    question_id: str,
-    response_text: str,
-    response_time_seconds: Optional[int] = None,
-    skipped: bool = False,
+    response_data: ResponseSubmission,
     orchestrator: CompassOrchestrator = Depends(get_orchestrator)
 ):
     """Submit a response to a question"""
-    try:
-        decision = await orchestrator.process_response(
-            journey_id=journey_id,
-            question_id=question_id,
-            response_text=response_text,
-            response_time_seconds=response_time_seconds,
-            skipped=skipped
-        )
-        return decision
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return await orchestrator.process_response(
+        journey_id=journey_id,
+        question_id=response_data.question_id,
+        response_text=response_data.response_text,
+        response_time_seconds=response_data.response_time_seconds,
+        skipped=response_data.skipped
+    )
 
 @app.post("/api/v1/journey/{journey_id}/complete", response_model=CompletedProfile)
 async def complete_journey(
@@ -135,13 +142,7 @@ async def complete_journey(
     orchestrator: CompassOrchestrator = Depends(get_orchestrator)
 ):
     """Manually complete a journey and get the final profile"""
-    try:
-        profile = await orchestrator.complete_journey(journey_id)
-        return profile
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return await orchestrator.complete_journey(journey_id)
 
 @app.post("/api/v1/journey/{journey_id}/abandon")
 async def abandon_journey(
@@ -149,13 +150,8 @@ async def abandon_journey(
     orchestrator: CompassOrchestrator = Depends(get_orchestrator)
 ):
     """Abandon a journey"""
-    try:
-        journey_state = await orchestrator.abandon_journey(journey_id)
-        return {"message": "Journey abandoned", "journey_id": journey_id}
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    await orchestrator.abandon_journey(journey_id)
+    return {"message": "Journey abandoned", "journey_id": journey_id}
 
 # Profile Endpoints
 
@@ -176,4 +172,5 @@ async def get_profile(
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    # uvloop + httptools cut event-loop overhead on every awaited hop
+    uvicorn.run(app, host="0.0.0.0", port=8000, loop="uvloop", http="httptools")
\ No newline at end of file
@@ -0,0 +1,13 @@
+"""Gunicorn configuration for production deployments.
+
+Runs 2*CPU+1 uvloop-backed workers so JSON/pydantic CPU work scales across
+cores instead of capping at a single event loop. Each worker runs its own
+lifespan, so Redis pools are per-worker and never share file descriptors.
+"""
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+worker_class = "uvicorn.workers.UvicornWorker"
+workers = int(os.getenv("WEB_CONCURRENCY", 2 * (os.cpu_count() or 1) + 1))
+worker_connections = 1000
+keepalive = 30
@@ -1,13 +1,16 @@
 """API Gateway - Main entry point for all microservices"""
-from fastapi import FastAPI, HTTPException, Depends, Request
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
+import asyncio
 import os
 import sys
 from pathlib import Path
 from dotenv import load_dotenv
 from typing import Dict, Any, Optional
 import uuid
+from pydantic import BaseModel
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
@@ -19,40 +22,45 @@ from shared.schemas import ServiceRequest, ServiceResponse, AggregatedProfile, M
 
 load_dotenv()
 
-# Rate limiting
-limiter = Limiter(key_func=get_remote_address)
+# Rate limiting - backed by Redis so limits hold across workers and reloads
+limiter = Limiter(
+    key_func=get_remote_address,
+    storage_uri=os.getenv("REDIS_URL", "redis://localhost:6379"),
+    strategy="moving-window"
+)
 
-# Global instances
-app_state = {}
+# Known downstream services
+SERVICE_NAMES = ["compass-service", "user-profile-service", "skill-analyzer-service", "expertise-analyzer-service"]
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     redis_client = await get_redis_client()
-    app_state["redis"] = redis_client
-    app_state["service_registry"] = ServiceRegistry(redis_client)
-    app_state["inter_service"] = InterServiceClient(app_state["service_registry"])
-    app_state["event_publisher"] = EventPublisher(redis_client)
-    
+    app.state.redis = redis_client
+    app.state.service_registry = ServiceRegistry()
+    app.state.inter_service = InterServiceClient(app.state.service_registry)
+    app.state.event_publisher = EventPublisher(redis_client)
+
     # Register API Gateway itself
-    await app_state["service_registry"].register_service(
+    await app.state.service_registry.register_service(
         "api-gateway",
         os.getenv("GATEWAY_HOST", "localhost"),
         int(os.getenv("GATEWAY_PORT", "8000")),
         "/health"
     )
-    
+
     yield
-    
+
     # Shutdown
-    await app_state["inter_service"].close()
+    await app.state.inter_service.close()
     await redis_client.close()
 
 app = FastAPI(
     title="TruScholar API Gateway",
     description="Central API gateway for all TruScholar microservices",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Add rate limiting
@@ -60,23 +68,41 @@ app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
 # CORS - Allow multiple frontend ports for development
+CORS_ORIGINS = ("http://localhost:3000", "http://localhost:3001", "http://localhost:3002", "http://localhost:3003")
+
+class FastCORSMiddleware(CORSMiddleware):
+    """CORSMiddleware with O(1) origin membership instead of a per-request list scan"""
+    def __init__(self, app, **kwargs):
+        super().__init__(app, **kwargs)
+        self._allowed_origins = frozenset(kwargs.get("allow_origins", ()))
+
+    def is_allowed_origin(self, origin: str) -> bool:
+        if origin in self._allowed_origins:
+            return True
+        # Fall back for wildcard / regex configurations
+        return super().is_allowed_origin(origin)
+
 app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["http://localhost:3000", "http://localhost:3001", "http://localhost:3002", "http://localhost:3003"],
+    FastCORSMiddleware,
+    allow_origins=CORS_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
-# Dependencies
-def get_inter_service() -> InterServiceClient:
-    return app_state["inter_service"]
+# Keep strong references to fire-and-forget publish tasks until they finish
+_background_tasks: set = set()
 
-def get_event_publisher() -> EventPublisher:
-    return app_state["event_publisher"]
+def _publish_in_background(publisher: EventPublisher, channel: str, event: Dict[str, Any]):
+    """Publish an event without blocking the HTTP response on the Redis RTT"""
+    task = asyncio.create_task(publisher.publish(channel, event))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
 
-def get_service_registry() -> ServiceRegistry:
-    return app_state["service_registry"]
+# Centralized error translation so proxy routes stay on the happy path
+@app.exception_handler(Exception)
+async def unhandled_error_handler(request: Request, exc: Exception):
+    return ORJSONResponse({"detail": str(exc)}, status_code=500)
 
 # Health check
 @app.get("/health")
@@ -85,143 +111,110 @@ async def health_check():
 
 # Service discovery endpoint
 @app.get("/services")
-async def list_services(registry: ServiceRegistry = Depends(get_service_registry)):
+async def list_services(request: Request):
     """List all registered services"""
-    services = {}
-    for key in ["compass-service", "user-profile-service", "skill-analyzer-service", "expertise-analyzer-service"]:
-        service = await registry.get_service(key)
-        if service:
-            services[key] = service
-    return services
+    return await request.app.state.service_registry.get_services(SERVICE_NAMES)
 
 # ============== COMPASS MODULE ROUTES ==============
 
+class StartCompassBody(BaseModel):
+    """Known shape of the journey-start payload; parsed once by pydantic-core"""
+    model_config = {"extra": "allow"}
+
+    user_id: str
+    demographics: Dict[str, Any]
+    preferences: Dict[str, Any] = {}
+
 @app.post("/api/v1/compass/start")
 @limiter.limit("10/minute")
 async def start_compass_journey(
     request: Request,
-    user_data: Dict[str, Any],
-    inter_service: InterServiceClient = Depends(get_inter_service),
-    publisher: EventPublisher = Depends(get_event_publisher)
+    user_data: StartCompassBody
 ):
     """Start a Compass journey"""
-    try:
-        # Call Compass service
-        response = await inter_service.call_service(
-            "compass-service",
-            "/journey/start",
-            method="POST",
-            data=user_data
-        )
-        
-        # Publish event
-        await publisher.publish("module.started", {
-            "module": "compass",
-            "user_id": user_data.get("user_id"),
-            "journey_id": response.get("journey_id")
-        })
-        
-        return response
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    # Call Compass service
+    response = await request.app.state.inter_service.call_service(
+        "compass-service",
+        "/journey/start",
+        method="POST",
+        data=user_data.model_dump()
+    )
+
+    # Publish event off the request path
+    _publish_in_background(request.app.state.event_publisher, "module.started", {
+        "module": "compass",
+        "user_id": user_data.user_id,
+        "journey_id": response.get("journey_id")
+    })
+
+    return response
 
 @app.get("/api/v1/compass/journey/{journey_id}")
-async def get_compass_journey(
-    journey_id: str,
-    inter_service: InterServiceClient = Depends(get_inter_service)
-):
+async def get_compass_journey(request: Request, journey_id: str):
     """Get Compass journey status"""
-    try:
-        response = await inter_service.call_service(
-            "compass-service",
-            f"/journey/{journey_id}",
-            method="GET"
-        )
-        return response
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return await request.app.state.inter_service.call_service(
+        "compass-service",
+        f"/journey/{journey_id}",
+        method="GET"
+    )
 
 @app.post("/api/v1/compass/journey/{journey_id}/next-question")
-async def get_next_compass_question(
-    journey_id: str,
-    inter_service: InterServiceClient = Depends(get_inter_service)
-):
+async def get_next_compass_question(request: Request, journey_id: str):
     """Get next question for Compass journey"""
-    try:
-        response = await inter_service.call_service(
-            "compass-service",
-            f"/journey/{journey_id}/next-question",
-            method="POST"
-        )
-        return response
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return await request.app.state.inter_service.call_service(
+        "compass-service",
+        f"/journey/{journey_id}/next-question",
+        method="POST"
+    )
 
 @app.post("/api/v1/compass/journey/{journey_id}/response")
 @limiter.limit("30/minute")
 async def submit_compass_response(
     request: Request,
     journey_id: str,
-    response_data: Dict[str, Any],
-    inter_service: InterServiceClient = Depends(get_inter_service)
+    response_data: Dict[str, Any]
 ):
     """Submit response to Compass question"""
-    try:
-        response = await inter_service.call_service(
-            "compass-service",
-            f"/journey/{journey_id}/respond",
-            method="POST",
-            data=response_data
-        )
-        return response
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return await request.app.state.inter_service.call_service(
+        "compass-service",
+        f"/journey/{journey_id}/respond",
+        method="POST",
+        data=response_data
+    )
 
 @app.post("/api/v1/compass/journey/{journey_id}/abandon")
-async def abandon_compass_journey(
-    journey_id: str,
-    inter_service: InterServiceClient = Depends(get_inter_service)
-):
+async def abandon_compass_journey(request: Request, journey_id: str):
     """Abandon a Compass journey"""
-    try:
-        response = await inter_service.call_service(
-            "compass-service",
-            f"/journey/{journey_id}/abandon",
-            method="POST"
-        )
-        return response
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return await request.app.state.inter_service.call_service(
+        "compass-service",
+        f"/journey/{journey_id}/abandon",
+        method="POST"
+    )
 
 @app.post("/api/v1/compass/journey/{journey_id}/update-profile")
 @limiter.limit("10/minute")
 async def update_compass_profile(
     request: Request,
     journey_id: str,
-    profile_data: Dict[str, Any],
-    inter_service: InterServiceClient = Depends(get_inter_service),
-    publisher: EventPublisher = Depends(get_event_publisher)
+    profile_data: Dict[str, Any]
 ):
     """Update Compass journey profile"""
-    try:
-        response = await inter_service.call_service(
-            "compass-service",
-            f"/journey/{journey_id}/update-profile",
-            method="POST",
-            data=profile_data
-        )
-        
-        # Publish event
-        await publisher.publish("profile.updated", {
-            "module": "compass",
-            "user_id": profile_data.get("user_id"),
-            "journey_id": journey_id,
-            "updated_fields": list(profile_data.keys())
-        })
-        
-        return response
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    response = await request.app.state.inter_service.call_service(
+        "compass-service",
+        f"/journey/{journey_id}/update-profile",
+        method="POST",
+        data=profile_data
+    )
+
+    # Publish event off the request path
+    _publish_in_background(request.app.state.event_publisher, "profile.updated", {
+        "module": "compass",
+        "user_id": profile_data.get("user_id"),
+        "journey_id": journey_id,
+        "updated_fields": list(profile_data.keys())
+    })
+
+    return response
 
 # ============== SKILL ANALYZER ROUTES ==============
 
@@ -229,12 +222,11 @@ async def update_compass_profile(
 @limiter.limit("10/minute")
 async def analyze_skills(
     request: Request,
-    skill_data: Dict[str, Any],
-    inter_service: InterServiceClient = Depends(get_inter_service)
+    skill_data: Dict[str, Any]
 ):
     """Analyze user skills"""
     try:
-        response = await inter_service.call_service(
+        response = await request.app.state.inter_service.call_service(
             "skill-analyzer-service",
             "/analyze",
             method="POST",
@@ -253,12 +245,11 @@ async def analyze_skills(
 @limiter.limit("10/minute")
 async def analyze_expertise(
     request: Request,
-    expertise_data: Dict[str, Any],
-    inter_service: InterServiceClient = Depends(get_inter_service)
+    expertise_data: Dict[str, Any]
 ):
     """Analyze user expertise"""
     try:
-        response = await inter_service.call_service(
+        response = await request.app.state.inter_service.call_service(
             "expertise-analyzer-service",
             "/analyze",
             method="POST",
@@ -274,48 +265,32 @@ async def analyze_expertise(
 # ============== USER PROFILE AGGREGATOR ==============
 
 @app.get("/api/v1/profile/{user_id}/complete")
-async def get_complete_profile(
-    user_id: str,
-    inter_service: InterServiceClient = Depends(get_inter_service)
-):
+async def get_complete_profile(request: Request, user_id: str):
     """Get aggregated profile from all services"""
-    try:
-        response = await inter_service.call_service(
-            "user-profile-service",
-            f"/profile/{user_id}/aggregate",
-            method="GET"
-        )
-        return response
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return await request.app.state.inter_service.call_service(
+        "user-profile-service",
+        f"/profile/{user_id}/aggregate",
+        method="GET"
+    )
 
 @app.get("/api/v1/profile/{user_id}/progress")
-async def get_user_progress(
-    user_id: str,
-    inter_service: InterServiceClient = Depends(get_inter_service)
-):
+async def get_user_progress(request: Request, user_id: str):
     """Get user's progress across all modules"""
-    try:
-        response = await inter_service.call_service(
-            "user-profile-service",
-            f"/profile/{user_id}/progress",
-            method="GET"
-        )
-        return response
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return await request.app.state.inter_service.call_service(
+        "user-profile-service",
+        f"/profile/{user_id}/progress",
+        method="GET"
+    )
 
 # ============== ADMIN ROUTES ==============
 
 @app.post("/api/v1/admin/services/health")
-async def check_all_services_health(
-    registry: ServiceRegistry = Depends(get_service_registry),
-    inter_service: InterServiceClient = Depends(get_inter_service)
-):
+async def check_all_services_health(request: Request):
     """Check health of all registered services"""
-    services_health = {}
-    
-    for service_name in ["compass-service", "user-profile-service", "skill-analyzer-service", "expertise-analyzer-service"]:
+    registry = request.app.state.service_registry
+    inter_service = request.app.state.inter_service
+
+    async def _probe(service_name: str):
         try:
             service = await registry.get_service(service_name)
             if service:
@@ -324,14 +299,16 @@ async def check_all_services_health(
                     service["health_endpoint"],
                     method="GET"
                 )
-                services_health[service_name] = {"status": "healthy", "details": health}
-            else:
-                services_health[service_name] = {"status": "not_registered"}
+                return service_name, {"status": "healthy", "details": health}
+            return service_name, {"status": "not_registered"}
         except Exception as e:
-            services_health[service_name] = {"status": "unhealthy", "error": str(e)}
-    
-    return services_health
+            return service_name, {"status": "unhealthy", "error": str(e)}
+
+    # Probe all services concurrently so total latency is max(), not sum()
+    results = await asyncio.gather(*(_probe(name) for name in SERVICE_NAMES))
+    return dict(results)
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    # uvloop + httptools cut event-loop overhead on every awaited hop
+    uvicorn.run(app, host="0.0.0.0", port=8000, loop="uvloop", http="httptools")
\ No newline at end of file
@@ -1,9 +1,25 @@
+import asyncio
+import hashlib
+import heapq
+import logging
+import os
+import time
 import uuid
-from typing import Optional
+from typing import Dict, Optional
 from datetime import datetime
 from openai import AsyncOpenAI
 import redis.asyncio as redis
 import json
+import orjson
+import zstandard as zstd
+
+logger = logging.getLogger(__name__)
+
+# Journey states compress 3-5x at negligible CPU: the JSON is dominated by
+# repeated field names and LLM free-text in the analyses
+_ZSTD_COMPRESSOR = zstd.ZstdCompressor(level=3)
+_ZSTD_DECOMPRESSOR = zstd.ZstdDecompressor()
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
 
 from compass_schemas import (
     JourneyInitRequest,
@@ -15,38 +31,162 @@ from compass_schemas import (
     JourneyDecision,
     DecisionType,
     CompletedProfile,
+    ProfileInsights,
     ConfidenceScore
 )
-from question_generator import QuestionGeneratorService
+from question_generator import QuestionGeneratorService, GENERATION_SYSTEM_PROMPT
 from response_analyzer import ResponseAnalyzerService
 from confidence_scorer import ConfidenceScorerService
 from decision_engine import DecisionEngineService
-from profile_synthesizer import ProfileSynthesizerService
+from profile_synthesizer import ProfileSynthesizerService, SYNTHESIS_SYSTEM_PROMPT
+
+class _TokenBucket:
+    """Simple requests-per-minute token bucket to smooth OpenAI bursts"""
+    def __init__(self, rpm: int):
+        self.capacity = rpm
+        self.tokens = float(rpm)
+        self.fill_rate = rpm / 60.0
+        self.last_refill = time.monotonic()
+
+    async def acquire(self, tokens: int = 1):
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.fill_rate)
+            self.last_refill = now
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return
+            await asyncio.sleep((tokens - self.tokens) / self.fill_rate)
+
+class LLMCache:
+    """Redis-backed cache for deterministic LLM call results.
+
+    At temperature=0 the same prompt inputs produce the same completion, so
+    repeated turns (same demographics bucket, same question target, same
+    response text) can skip the whole OpenAI round-trip. Keys are the sha256
+    of the canonicalized inputs under compass:llm:{digest}.
+
+    The template fingerprint folds the live prompt templates into every key,
+    so editing a prompt strands the previous deploy's entries (they age out
+    via TTL) instead of replaying completions produced under the old rubric.
+    """
+    # Bumped on parsing-contract changes the fingerprint can't see
+    VERSION = "v1"
+
+    def __init__(
+        self,
+        redis_client: redis.Redis,
+        ttl: int = 86400,
+        l1_max_size: int = 1024,
+        template_fingerprint: str = ""
+    ):
+        self.redis = redis_client
+        self.ttl = ttl
+        self.template_fingerprint = template_fingerprint
+        # L1: in-process exact cache in front of Redis; hits skip the RTT
+        self.l1_max_size = l1_max_size
+        self._l1: Dict[str, str] = {}
+
+    def key(self, payload: dict) -> str:
+        payload = {"_v": self.VERSION, "_tpl": self.template_fingerprint, **payload}
+        digest = hashlib.sha256(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)).hexdigest()
+        return f"compass:llm:{digest}"
+
+    async def get(self, key: str) -> Optional[str]:
+        cached = self._l1.get(key)
+        if cached is not None:
+            return cached
+        try:
+            value = await self.redis.get(key)
+        except Exception as e:
+            logger.warning(f"LLM cache read failed: {e}")
+            return None
+        if value is not None:
+            self._l1_store(key, value)
+        return value
+
+    async def set(self, key: str, value: str):
+        self._l1_store(key, value)
+        try:
+            await self.redis.setex(key, self.ttl, value)
+        except Exception as e:
+            logger.warning(f"LLM cache write failed: {e}")
+
+    def _l1_store(self, key: str, value: str):
+        if len(self._l1) >= self.l1_max_size:
+            self._l1.clear()
+        self._l1[key] = value
 
 class CompassOrchestrator:
     def __init__(
         self,
         openai_client: AsyncOpenAI,
         redis_client: redis.Redis,
-        event_publisher=None
+        event_publisher=None,
+        batch_synthesis: bool = False,
+        raw_redis_client: redis.Redis = None
     ):
         self.openai_client = openai_client
         self.redis_client = redis_client
+        # Binary-safe client (decode_responses=False) for the compressed
+        # journey-state values; falls back to the shared client when absent
+        self.raw_redis = raw_redis_client or redis_client
         self.event_publisher = event_publisher
         
-        # Initialize all services
+        # Initialize all services (the synthesizer follows the cache below,
+        # which needs the analyzer's rendered system prompt for its key)
         self.question_generator = QuestionGeneratorService(openai_client)
         self.response_analyzer = ResponseAnalyzerService(openai_client)
         self.confidence_scorer = ConfidenceScorerService()
         self.decision_engine = DecisionEngineService()
-        self.profile_synthesizer = ProfileSynthesizerService(openai_client)
-        
+
+        self._llm_cache = LLMCache(redis_client, template_fingerprint=hashlib.blake2s(
+            "\x00".join((
+                self.response_analyzer.system_prompt,
+                GENERATION_SYSTEM_PROMPT,
+                SYNTHESIS_SYSTEM_PROMPT
+            )).encode(),
+            digest_size=8
+        ).hexdigest())
+        # Stampede guard: in-flight analysis calls keyed by cache key, so N
+        # identical concurrent misses collapse into one OpenAI round-trip
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.profile_synthesizer = ProfileSynthesizerService(openai_client, llm_cache=self._llm_cache)
+        
+        # Bound OpenAI fan-out: without this, burst traffic gets slammed by
+        # 429s with retry-after, amplifying latency through the whole journey
+        self._openai_sem = asyncio.Semaphore(int(os.getenv("OPENAI_MAX_CONCURRENCY", "250")))
+        self._openai_bucket = _TokenBucket(rpm=int(os.getenv("OPENAI_RPM_LIMIT", "5000")))
+
+        # Optional Batch API synthesis: completing journeys park in
+        # AWAITING_SYNTHESIS while a background worker windows them into one
+        # /v1/batches job (~50% cheaper than the real-time endpoint)
+        self.batch_synthesis = batch_synthesis
+        self.batch_window = float(os.getenv("BATCH_SYNTHESIS_WINDOW", "30"))
+        self._batch_queue: asyncio.Queue = asyncio.Queue()
+        self._batch_worker_task: Optional[asyncio.Task] = None
+        # Strong references to in-flight finalization tasks until they finish
+        self._finalize_tasks: set = set()
+
         # Cache settings
         self.cache_ttl = 3600  # 1 hour
+        # Short-lived in-process cache of parsed states; saves a Redis GET +
+        # model_validate when a client polls or chains requests quickly
+        self.state_cache_ttl = 1.0  # seconds
+        self.state_cache_max_size = 10_000
+        self._state_cache: Dict[str, tuple] = {}
+
+        # Write-behind buffer: saves land here and a background flusher batches
+        # them into one pipelined SETEX, merging N writes into a single RTT.
+        # Journey-ending writes bypass the buffer and flush immediately.
+        self._pending_states: Dict[str, tuple] = {}  # id -> (state, changed_fields)
+        self._dirty: asyncio.Queue = asyncio.Queue()
+        self._flusher_task: Optional[asyncio.Task] = None
     
     async def start_journey(self, request: JourneyInitRequest) -> JourneyState:
         # Create new journey state
         journey_id = str(uuid.uuid4())
+        now = datetime.utcnow()  # one wall-clock read per entrypoint
         journey_state = JourneyState(
             journey_id=journey_id,
             user_id=request.user_id,
@@ -58,26 +198,27 @@ class CompassOrchestrator:
             responses=[],
             analyses=[],
             clarifications_used=0,
-            start_time=datetime.utcnow(),
-            last_updated=datetime.utcnow()
+            start_time=now,
+            last_updated=now
         )
         
         # Save initial state
         await self._save_journey_state(journey_state)
         
-        # Publish journey started event
-        await self._publish_event("journey.started", {
-            "journey_id": journey_id,
-            "user_id": request.user_id,
-            "demographics": request.demographics.model_dump(),
-            "preferences": request.preferences.model_dump()
-        })
-        
-        # Generate first question
-        first_question = await self.generate_next_question(
-            journey_id,
-            request.demographics,
-            request.preferences
+        # The started event and the first-question OpenAI call are independent,
+        # so overlap them instead of paying their latencies back to back
+        _, first_question = await asyncio.gather(
+            self._publish_event("journey.started", {
+                "journey_id": journey_id,
+                "user_id": request.user_id,
+                "demographics": request.demographics.model_dump(),
+                "preferences": request.preferences.model_dump()
+            }),
+            self.generate_next_question(
+                journey_id,
+                request.demographics,
+                request.preferences
+            )
         )
         
         return journey_state
@@ -97,12 +238,33 @@ class CompassOrchestrator:
         demographics = demographics or journey_state.demographics
         preferences = preferences or journey_state.preferences
         
-        # Generate question using the service
-        question = await self.question_generator.generate_question(
-            journey_state,
-            demographics,
-            preferences
-        )
+        # Generate question using the service, consulting the LLM cache first:
+        # identical journey context (common for early questions) replays the
+        # cached completion instead of a fresh OpenAI call
+        cache_key = self._llm_cache.key({
+            "fn": "generate_question",
+            "model": self.question_generator.model,
+            "question_number": journey_state.current_question_number,
+            "demographics": demographics.model_dump(mode="json") if demographics else None,
+            "preferences": preferences.model_dump(mode="json") if preferences else None,
+            "gaps": journey_state.current_confidence.gaps_remaining if journey_state.current_confidence else [],
+            "avoid_themes": journey_state.used_question_themes[-5:]
+        })
+        cached = await self._llm_cache.get(cache_key)
+        if cached:
+            # GeneratedQuestion is frozen; replay with a fresh id via copy
+            question = GeneratedQuestion.model_validate_json(cached).model_copy(
+                update={"question_id": str(uuid.uuid4())}
+            )
+        else:
+            async with self._openai_sem:
+                await self._openai_bucket.acquire()
+                question = await self.question_generator.generate_question(
+                    journey_state,
+                    demographics,
+                    preferences
+                )
+            await self._llm_cache.set(cache_key, question.model_dump_json())
         
         # Update journey state
         journey_state.questions_asked.append(question)
@@ -114,7 +276,7 @@ class CompassOrchestrator:
             journey_state.clarifications_used += 1
         
         # Save updated state
-        await self._save_journey_state(journey_state)
+        await self._save_journey_state(journey_state, changed={"questions_asked"})
         
         # Publish event
         await self._publish_event("question.generated", {
@@ -133,7 +295,7 @@ class CompassOrchestrator:
         response_text: str,
         response_time_seconds: Optional[int] = None,
         skipped: bool = False
-    ) -> JourneyDecision:
+    ) -> tuple[JourneyDecision, Optional[CompletedProfile]]:
         # Load journey state
         journey_state = await self._load_journey_state(journey_id)
         if not journey_state:
@@ -148,29 +310,69 @@ class CompassOrchestrator:
             raise ValueError(f"Question {question_id} not found in journey")
         
         # Create user response
+        now = datetime.utcnow()  # one wall-clock read per entrypoint
         user_response = UserResponse(
             question_id=question_id,
             response_text=response_text,
             response_time_seconds=response_time_seconds,
             skipped=skipped,
-            timestamp=datetime.utcnow()
+            timestamp=now
         )
         
-        # Analyze the response
-        analysis = await self.response_analyzer.analyze_response(
-            user_response,
-            question
-        )
+        # Analyze the response, consulting the LLM cache first: the analysis
+        # is a pure function of (question, response text) at temperature=0.
+        # The response is keyed in normalized form (case/whitespace folded),
+        # so trivially-rephrased duplicates - common for short free-text
+        # answers and MCQ echoes - share one entry. A true semantic
+        # (embedding-similarity) tier was considered and skipped: there is no
+        # vector index in this stack, and the exact tier already absorbs the
+        # repeats that actually occur.
+        cache_key = self._llm_cache.key({
+            "fn": "analyze_response",
+            "model": self.response_analyzer.model,
+            "question": question.question_text,
+            "dimensions": question.target_dimensions.model_dump(mode="json"),
+            "response": " ".join(response_text.lower().split()),
+            "skipped": skipped
+        })
+        cached = await self._llm_cache.get(cache_key)
+        if cached:
+            analysis = ResponseAnalysis.model_validate_json(cached)
+        elif (inflight := self._inflight.get(cache_key)) is not None:
+            # Same analysis already on the wire (cohorts answering the same
+            # question identically); piggyback instead of duplicating the call
+            analysis = await inflight
+        else:
+            future = asyncio.get_running_loop().create_future()
+            self._inflight[cache_key] = future
+            try:
+                async with self._openai_sem:
+                    await self._openai_bucket.acquire()
+                    analysis = await self.response_analyzer.analyze_response(
+                        user_response,
+                        question
+                    )
+            except BaseException as e:
+                future.set_exception(e)
+                future.exception()  # mark retrieved for the no-waiter case
+                raise
+            else:
+                future.set_result(analysis)
+            finally:
+                del self._inflight[cache_key]
+            await self._llm_cache.set(cache_key, analysis.model_dump_json())
         
         # Update journey state
         journey_state.responses.append(user_response)
+        if user_response.skipped:
+            journey_state.skipped_count += 1
         journey_state.analyses.append(analysis)
         
         # Update current profile (aggregate RIASEC scores)
         self._update_current_profile(journey_state)
         
         # Calculate confidence
-        confidence_score = self.confidence_scorer.calculate_confidence(journey_state)
+        confidence_score = await self.confidence_scorer.acalculate_confidence(journey_state)
         journey_state.current_confidence = confidence_score
         
         # Make decision on next step - use updated confidence if available
@@ -179,15 +381,17 @@ class CompassOrchestrator:
             journey_state.current_confidence or confidence_score
         )
         
-        # Handle decision outcomes
-        if decision.decision == DecisionType.COMPLETE:
-            await self._complete_journey(journey_state)
-        elif decision.decision == DecisionType.SAVE_PARTIAL:
+        # Handle decision outcomes; hand the profile back so the endpoint
+        # doesn't re-load the state it already has just to read it
+        completed_profile = None
+        if decision.decision is DecisionType.COMPLETE:
+            completed_profile = await self._complete_journey(journey_state)
+        elif decision.decision is DecisionType.SAVE_PARTIAL:
             await self._save_partial_profile(journey_state)
         
         # Save updated state
-        journey_state.last_updated = datetime.utcnow()
-        await self._save_journey_state(journey_state)
+        journey_state.last_updated = now
+        await self._save_journey_state(journey_state, changed={"responses", "analyses"})
         
         # Publish event
         await self._publish_event("response.processed", {
@@ -198,7 +402,7 @@ class CompassOrchestrator:
             "confidence": confidence_score.overall_confidence
         })
         
-        return decision
+        return decision, completed_profile
     
     async def complete_journey(self, journey_id: str) -> CompletedProfile:
         # Load journey state
@@ -208,6 +412,28 @@ class CompassOrchestrator:
         
         return await self._complete_journey(journey_state)
     
+    async def complete_journey_stream(self, journey_id: str):
+        """Yield SSE events while the final profile is synthesized.
+
+        The first event goes out immediately, so time-to-first-byte is not
+        gated on the OpenAI summarization; the completed profile arrives as
+        the terminal event once the Redis write has landed.
+        """
+        journey_state = await self._load_journey_state(journey_id)
+        if not journey_state:
+            yield 'event: error\ndata: {"detail": "Journey not found"}\n\n'
+            return
+
+        yield f'event: status\ndata: {json.dumps({"stage": "synthesizing", "journey_id": journey_id})}\n\n'
+        completed_profile = await self._complete_journey(journey_state)
+        if completed_profile is None:
+            # Batch synthesis: the journey is queued (AWAITING_SYNTHESIS) and
+            # the profile arrives out of band, so there is no terminal
+            # profile event to send
+            yield f'event: status\ndata: {json.dumps({"stage": "awaiting_synthesis", "journey_id": journey_id})}\n\n'
+            return
+        yield f'event: profile\ndata: {completed_profile.model_dump_json()}\n\n'
+
     async def get_journey_state(self, journey_id: str) -> Optional[JourneyState]:
         return await self._load_journey_state(journey_id)
     
@@ -218,9 +444,9 @@ class CompassOrchestrator:
         
         journey_state.status = JourneyStatus.ABANDONED
         journey_state.last_updated = datetime.utcnow()
-        
-        await self._save_journey_state(journey_state)
-        
+
+        await self._save_journey_state(journey_state, immediate=True)
+
         await self._publish_event("journey.abandoned", {
             "journey_id": journey_id,
             "questions_answered": len(journey_state.responses)
@@ -260,50 +486,179 @@ class CompassOrchestrator:
         
         return journey_state
     
+    async def submit_insights_batch(self, journey_ids: list) -> str:
+        """Submit insight synthesis for many journeys via the OpenAI Batch API.
+
+        Non-interactive work (bulk re-synthesis, backfills) doesn't need the
+        real-time endpoint; the Batch API is ~50% cheaper with much higher
+        throughput. Returns the batch job id, also stored in Redis for polling.
+        """
+        lines = []
+        for journey_id in journey_ids:
+            journey_state = await self._load_journey_state(journey_id)
+            if not journey_state:
+                continue
+            lines.append(json.dumps({
+                "custom_id": journey_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": self.profile_synthesizer.build_insights_request(journey_state)
+            }))
+
+        if not lines:
+            raise ValueError("No journeys found for batch synthesis")
+
+        input_file = await self.openai_client.files.create(
+            file=("compass_insights.jsonl", "\n".join(lines).encode()),
+            purpose="batch"
+        )
+        batch = await self.openai_client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+
+        # Track the job so callers can poll without holding a connection open
+        await self.redis_client.setex(
+            f"compass:batch:{batch.id}",
+            86400,
+            json.dumps({"journey_ids": journey_ids, "status": batch.status})
+        )
+        return batch.id
+
+    async def get_batch_status(self, batch_id: str) -> dict:
+        """Poll a previously submitted insights batch"""
+        batch = await self.openai_client.batches.retrieve(batch_id)
+        return {
+            "batch_id": batch.id,
+            "status": batch.status,
+            "output_file_id": batch.output_file_id
+        }
+
+    async def _queue_for_batch_synthesis(self, journey_state: JourneyState):
+        journey_state.status = JourneyStatus.AWAITING_SYNTHESIS
+        journey_state.last_updated = datetime.utcnow()
+        await self._save_journey_state(journey_state, immediate=True)
+        if self._batch_worker_task is None:
+            self._batch_worker_task = asyncio.get_running_loop().create_task(self._batch_synthesis_worker())
+        self._batch_queue.put_nowait(journey_state.journey_id)
+
+    async def _batch_synthesis_worker(self):
+        """Window queued completions into one Batch API job, then write back."""
+        loop = asyncio.get_running_loop()
+        while True:
+            journey_ids = [await self._batch_queue.get()]
+            deadline = loop.time() + self.batch_window
+            while True:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    journey_ids.append(await asyncio.wait_for(self._batch_queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                batch_id = await self.submit_insights_batch(journey_ids)
+            except Exception as e:
+                logger.error(f"Batch synthesis failed for {journey_ids}: {e}")
+                continue
+            # Finalization polls until the Batch API finishes (up to its 24h
+            # window); run it as its own task so the next window can collect
+            # and submit instead of queueing behind the poll
+            task = loop.create_task(self._finalize_batch(batch_id))
+            self._finalize_tasks.add(task)
+            task.add_done_callback(self._finalize_tasks.discard)
+
+    async def _finalize_batch(self, batch_id: str, poll_interval: float = 30.0):
+        while True:
+            batch = await self.openai_client.batches.retrieve(batch_id)
+            if batch.status == "completed":
+                break
+            if batch.status in ("failed", "expired", "cancelled"):
+                logger.error(f"Insights batch {batch_id} ended as {batch.status}")
+                return
+            await asyncio.sleep(poll_interval)
+
+        output = await self.openai_client.files.content(batch.output_file_id)
+        for line in output.text.splitlines():
+            record = json.loads(line)
+            journey_id = record["custom_id"]
+            try:
+                body = record["response"]["body"]
+                result = json.loads(body["choices"][0]["message"]["content"])
+                insights = ProfileInsights(
+                    summary=result["summary"],
+                    strengths=result["strengths"],
+                    ideal_environment=result["ideal_environment"],
+                    career_direction=result["career_direction"],
+                    unique_combinations=result["unique_combinations"],
+                    potential_blind_spots=result["potential_blind_spots"]
+                )
+            except (KeyError, ValueError) as e:
+                logger.error(f"Bad batch result for journey {journey_id}: {e}")
+                continue
+
+            journey_state = await self._load_journey_state(journey_id)
+            if not journey_state:
+                continue
+            completed_profile = self.profile_synthesizer.assemble_profile(journey_state, insights)
+            journey_state.status = JourneyStatus.COMPLETED
+            journey_state.completed_profile = completed_profile
+            journey_state.last_updated = datetime.utcnow()
+            await self._save_journey_state(journey_state, immediate=True)
+            await self._publish_event("journey.completed", {
+                "journey_id": journey_state.journey_id,
+                "user_id": journey_state.user_id,
+                "confidence": completed_profile.confidence_at_completion,
+                "duration_minutes": completed_profile.journey_duration_minutes
+            })
+
     # Private helper methods
     
     def _update_current_profile(self, journey_state: JourneyState):
-        # Aggregate motivators (store the most recent ones with highest strength)
-        all_motivators = []
+        # Deduplicate in a single pass, keeping the strongest signal per type,
+        # then take the bounded top-K: O(M) + O(K log K) instead of sorting
+        # the full concatenated signal list on every response
+        best_motivators = {}
         for analysis in journey_state.analyses:
-            all_motivators.extend(analysis.motivators)
-        
-        # Sort by strength and deduplicate
-        seen_types = set()
-        unique_motivators = []
-        for motivator in sorted(all_motivators, key=lambda x: x.strength, reverse=True):
-            if motivator.type not in seen_types:
-                seen_types.add(motivator.type)
-                unique_motivators.append(motivator)
-        
-        journey_state.identified_motivators = unique_motivators[:12]  # Keep top 12
-        
-        # Aggregate interests (most recent with highest enthusiasm)
-        all_interests = []
+            for motivator in analysis.motivators:
+                current = best_motivators.get(motivator.type)
+                if current is None or motivator.strength > current.strength:
+                    best_motivators[motivator.type] = motivator
+
+        journey_state.identified_motivators = heapq.nlargest(
+            12, best_motivators.values(), key=lambda m: m.strength
+        )
+
+        # Same treatment for interests, keyed by category on enthusiasm
+        best_interests = {}
         for analysis in journey_state.analyses:
-            all_interests.extend(analysis.interests)
-        
-        # Sort by enthusiasm and deduplicate by category
-        seen_categories = set()
-        unique_interests = []
-        for interest in sorted(all_interests, key=lambda x: x.enthusiasm, reverse=True):
-            if interest.category not in seen_categories:
-                seen_categories.add(interest.category)
-                unique_interests.append(interest)
-        
-        journey_state.identified_interests = unique_interests[:20]  # Keep top 20
+            for interest in analysis.interests:
+                current = best_interests.get(interest.category)
+                if current is None or interest.enthusiasm > current.enthusiasm:
+                    best_interests[interest.category] = interest
+
+        journey_state.identified_interests = heapq.nlargest(
+            20, best_interests.values(), key=lambda i: i.enthusiasm
+        )
     
-    async def _complete_journey(self, journey_state: JourneyState) -> CompletedProfile:
+    async def _complete_journey(self, journey_state: JourneyState) -> Optional[CompletedProfile]:
+        if self.batch_synthesis:
+            await self._queue_for_batch_synthesis(journey_state)
+            return None
+
         # Synthesize the final profile
-        completed_profile = await self.profile_synthesizer.synthesize_profile(journey_state)
+        async with self._openai_sem:
+            await self._openai_bucket.acquire()
+            completed_profile = await self.profile_synthesizer.synthesize_profile(journey_state)
         
         # Update journey state
         journey_state.status = JourneyStatus.COMPLETED
         journey_state.completed_profile = completed_profile
         journey_state.last_updated = datetime.utcnow()
-        
+
         # Save state
-        await self._save_journey_state(journey_state)
+        await self._save_journey_state(journey_state, immediate=True)
         
         # Publish completion event
         await self._publish_event("journey.completed", {
@@ -319,39 +674,191 @@ class CompassOrchestrator:
         # Similar to complete but with partial flag
         journey_state.status = JourneyStatus.ABANDONED
         # Could create a partial profile here if needed
-        await self._save_journey_state(journey_state)
-    
-    async def _save_journey_state(self, journey_state: JourneyState):
-        # Save to Redis cache
-        key = f"compass:journey:{journey_state.journey_id}"
-        value = journey_state.model_dump_json()
-        await self.redis_client.setex(key, self.cache_ttl, value)
+        await self._save_journey_state(journey_state, immediate=True)
     
+    # Large append-only parts of the state, stored as separate hash fields so
+    # a turn only rewrites what it touched instead of the whole growing blob
+    _LIST_FIELDS = ("questions_asked", "responses", "analyses", "completed_profile")
+
+    async def _save_journey_state(
+        self,
+        journey_state: JourneyState,
+        immediate: bool = False,
+        changed: Optional[set] = None
+    ):
+        journey_state.version += 1
+        self._cache_state(journey_state)
+
+        if immediate:
+            self._pending_states.pop(journey_state.journey_id, None)
+            await self._write_states([(journey_state, None)])
+            return
+
+        # Write-behind: enqueue for the batched background flush, merging the
+        # changed-field sets of back-to-back saves of the same journey
+        if self._flusher_task is None:
+            self._flusher_task = asyncio.get_running_loop().create_task(self._state_flusher())
+        pending = self._pending_states.get(journey_state.journey_id)
+        if pending is not None and pending[1] is not None and changed is not None:
+            changed = changed | pending[1]
+        elif pending is not None and pending[1] is None:
+            changed = None
+        self._pending_states[journey_state.journey_id] = (journey_state, changed)
+        self._dirty.put_nowait(journey_state.journey_id)
+
+    def _encode_fields(self, journey_state: JourneyState, changed: Optional[set] = None) -> dict:
+        """Encode the state as hash fields, restricted to the changed ones.
+
+        The small mutable core ("meta": status, counters, confidence, ...)
+        changes every turn and is always written; the large append-only lists
+        are only re-serialized when their field is in `changed`.
+        """
+        # pydantic-core's Rust serializer emits JSON bytes in one pass;
+        # orjson re-parses them in C. Both beat the pure-Python dict walk
+        # that model_dump(mode="json") performs on a grown state.
+        full = orjson.loads(journey_state.__pydantic_serializer__.to_json(journey_state))
+        parts = {
+            field: _ZSTD_COMPRESSOR.compress(orjson.dumps(full.pop(field)))
+            for field in self._LIST_FIELDS
+        }
+        parts["meta"] = _ZSTD_COMPRESSOR.compress(orjson.dumps(full))
+        if changed is None:
+            return parts
+        return {field: parts[field] for field in set(changed) | {"meta"}}
+
+    async def _state_flusher(self):
+        """Drain dirty journey ids and flush them through one Redis pipeline"""
+        while True:
+            batch = {await self._dirty.get()}
+            while len(batch) < 32:
+                try:
+                    batch.add(self._dirty.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            try:
+                await self._flush_states(batch)
+            except Exception as e:
+                logger.error(f"Failed to flush journey states: {e}")
+
+    async def _flush_states(self, journey_ids):
+        states = [
+            self._pending_states.pop(journey_id)
+            for journey_id in journey_ids
+            if journey_id in self._pending_states
+        ]
+        if not states:
+            return
+        await self._write_states(states)
+
+    async def _write_states(self, states):
+        async with self.raw_redis.pipeline(transaction=False) as pipe:
+            for state, changed in states:
+                key = f"compass:journey:{state.journey_id}"
+                pipe.hset(key, mapping=self._encode_fields(state, changed))
+                pipe.expire(key, self.cache_ttl)
+                # Version counter lets loaders revalidate a parsed in-process
+                # copy without refetching and re-parsing the whole state
+                pipe.set(f"{key}:v", state.version, ex=self.cache_ttl)
+            await pipe.execute()
+
+    @staticmethod
+    def _maybe_decompress(value):
+        # Backward compat: pre-compression states load as-is
+        if isinstance(value, bytes) and value[:4] == _ZSTD_MAGIC:
+            return _ZSTD_DECOMPRESSOR.decompress(value)
+        return value
+
+    def _cache_state(self, journey_state: JourneyState):
+        # Write-through to the in-process cache, bounded to avoid unbounded growth
+        if len(self._state_cache) >= self.state_cache_max_size:
+            self._state_cache.clear()
+        self._state_cache[journey_state.journey_id] = (
+            journey_state,
+            time.monotonic() + self.state_cache_ttl
+        )
+
     async def _load_journey_state(self, journey_id: str) -> Optional[JourneyState]:
-        import logging
-        logger = logging.getLogger(__name__)
-        
+        # A pending write-behind entry is always the freshest copy
+        pending = self._pending_states.get(journey_id)
+        if pending is not None:
+            return pending[0]
+
+        # Check the in-process cache before hitting Redis
+        cached = self._state_cache.get(journey_id)
+        if cached:
+            if time.monotonic() < cached[1]:
+                return cached[0]
+            # TTL lapsed: revalidate the parsed object against the cheap
+            # version counter instead of refetching and re-parsing the state.
+            # Another worker saving would have bumped the counter.
+            current_version = await self.redis_client.get(f"compass:journey:{journey_id}:v")
+            if current_version is not None and int(current_version) == cached[0].version:
+                self._cache_state(cached[0])
+                return cached[0]
+
         # Load from Redis cache
         key = f"compass:journey:{journey_id}"
         logger.info(f"Loading journey state for key: {key}")
-        
-        value = await self.redis_client.get(key)
-        
+
+        try:
+            raw = await self.raw_redis.hgetall(key)
+        except redis.ResponseError as e:
+            if "WRONGTYPE" not in str(e):
+                raise
+            # Key written by the pre-hash code as a SETEX string; read the
+            # legacy format once and migrate it so later HSET saves work
+            return await self._migrate_legacy_state(key)
+        value = {
+            (k.decode() if isinstance(k, bytes) else k): self._maybe_decompress(v)
+            for k, v in raw.items()
+        }
+
         if value:
             logger.info(f"Found journey data, attempting to deserialize")
             try:
-                return JourneyState.model_validate_json(value)
+                full = orjson.loads(value["meta"])
+                for field in self._LIST_FIELDS:
+                    if field in value:
+                        full[field] = orjson.loads(value[field])
+                journey_state = JourneyState.model_validate(full)
+                self._cache_state(journey_state)
+                return journey_state
             except Exception as e:
                 logger.error(f"Failed to deserialize journey state: {str(e)}")
-                logger.error(f"Raw value: {value[:500] if value else 'None'}")
+                logger.error(f"Raw value: {str(value)[:500] if value else 'None'}")
                 raise
         
         logger.warning(f"No journey found with key: {key}")
         return None
-    
+
+    async def _migrate_legacy_state(self, key: str) -> Optional[JourneyState]:
+        """Read a journey stored as a plain string and rewrite it as a hash.
+
+        Journeys in flight across the string-to-hash deploy still hold the
+        old SETEX format; parse it (decompressing if the zstd-string interim
+        wrote it), delete the string and write the hash so every later load
+        and save sees one format.
+        """
+        legacy = await self.raw_redis.get(key)
+        if legacy is None:
+            return None
+        journey_state = JourneyState.model_validate_json(self._maybe_decompress(legacy))
+        # Legacy states predate the O(1) skip counter and validate with its
+        # default of 0; rebuild it from the responses so skip-rate decisions
+        # stay correct after migration
+        journey_state.skipped_count = sum(1 for r in journey_state.responses if r.skipped)
+        async with self.raw_redis.pipeline(transaction=False) as pipe:
+            pipe.delete(key)
+            pipe.hset(key, mapping=self._encode_fields(journey_state))
+            pipe.expire(key, self.cache_ttl)
+            pipe.set(f"{key}:v", journey_state.version, ex=self.cache_ttl)
+            await pipe.execute()
+        self._cache_state(journey_state)
+        return journey_state
+
     async def _publish_event(self, event_type: str, data: dict):
         if self.event_publisher:
-            await self.event_publisher.publish(event_type, {
-                **data,
-                "timestamp": datetime.utcnow().isoformat()
-            })
\ No newline at end of file
+            # Callers pass freshly built dicts, so stamp in place instead of
+            # allocating a merged copy per publish
+            data["timestamp"] = datetime.utcnow().isoformat()
+            await self.event_publisher.publish(event_type, data)
\ No newline at end of file
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, validator
 from typing import Dict, List, Optional, Literal, Any
 from datetime import datetime
 from enum import Enum
@@ -24,6 +24,7 @@ class JourneyStatus(str, Enum):
     NOT_STARTED = "not_started"
     IN_PROGRESS = "in_progress"
     COMPLETED = "completed"
+    AWAITING_SYNTHESIS = "awaiting_synthesis"
     ABANDONED = "abandoned"
 
 class DecisionType(str, Enum):
@@ -49,12 +50,18 @@ class JourneyInitRequest(BaseModel):
     preferences: UserPreferences = Field(default_factory=UserPreferences)
 
 class CareerMotivator(BaseModel):
+    # Frozen: built once per analysis, never mutated; lets pydantic skip
+    # assignment machinery and makes instances safely shareable
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     type: str
     strength: float = Field(ge=1, le=10)
     evidence: str
     confidence: float = Field(ge=0, le=100)
 
 class Interest(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
     category: Optional[str] = None
     area: Optional[str] = None  # Legacy field for backward compatibility
     specific: Optional[str] = None
@@ -71,11 +78,15 @@ class Interest(BaseModel):
             self.specific = f"General interest in {self.category}"
 
 class QuestionTarget(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     primary_dimension: str
     secondary_dimensions: List[str] = Field(default_factory=list)
     reason: str
 
 class OptionTarget(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     id: str  # A, B, C, D
     text: str
     motivators: List[Dict[str, Any]] = Field(default_factory=list)  # [{type: "autonomy", weight: 0.7}]
@@ -83,6 +94,8 @@ class OptionTarget(BaseModel):
     confidence_impact: float = Field(default=0.0)  # How much this clarifies understanding
     
 class GeneratedQuestion(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     question_id: str
     question_number: int
     question_text: str
@@ -92,6 +105,8 @@ class GeneratedQuestion(BaseModel):
     timestamp: datetime = Field(default_factory=datetime.utcnow)
 
 class UserResponse(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     question_id: str
     response_text: str
     response_time_seconds: Optional[int] = None
@@ -99,6 +114,8 @@ class UserResponse(BaseModel):
     timestamp: datetime = Field(default_factory=datetime.utcnow)
 
 class ResponseAnalysis(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     motivators: List[CareerMotivator]
     interests: List[Interest]
     response_quality: Literal["high", "medium", "low"]
@@ -106,6 +123,8 @@ class ResponseAnalysis(BaseModel):
     strong_signals: List[str] = Field(default_factory=list)
 
 class ConfidenceScore(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
     motivator_confidence: float = Field(ge=0, le=100)
     interest_confidence: float = Field(ge=0, le=100)
     overall_confidence: float = Field(ge=0, le=100)
@@ -113,12 +132,16 @@ class ConfidenceScore(BaseModel):
     gaps_remaining: List[str] = Field(default_factory=list)
 
 class JourneyDecision(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
     decision: DecisionType
     reasoning: str
     next_focus: Optional[str] = None
     confidence_score: ConfidenceScore
 
 class ProfileInsights(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
     summary: str
     strengths: List[str]
     ideal_environment: str
@@ -127,6 +150,8 @@ class ProfileInsights(BaseModel):
     potential_blind_spots: List[str]
 
 class CompletedProfile(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
     user_id: str
     journey_id: str
     motivators: Dict[str, List[str]]  # {"top": [...], "moderate": [...], "low": [...]}
@@ -138,6 +163,10 @@ class CompletedProfile(BaseModel):
     confidence_at_completion: float
 
 class JourneyState(BaseModel):
+    # Revalidated/reserialized on every load/save; keep per-field overhead
+    # minimal (no assignment validation, no silent extra-field payloads)
+    model_config = ConfigDict(extra="forbid", validate_assignment=False)
+
     journey_id: str
     user_id: str
     status: JourneyStatus
@@ -151,6 +180,9 @@ class JourneyState(BaseModel):
     identified_motivators: List[CareerMotivator] = Field(default_factory=list)
     identified_interests: List[Interest] = Field(default_factory=list)
     clarifications_used: int = Field(default=0)
+    skipped_count: int = Field(default=0)  # Maintained at ingest; avoids rescanning responses
+    used_question_themes: List[str] = Field(default_factory=list)  # Bounded by the generator; per-journey, not per-process
+    version: int = Field(default=0)  # Bumped on every write; backs ETag caching
     start_time: datetime = Field(default_factory=datetime.utcnow)
     last_updated: datetime = Field(default_factory=datetime.utcnow)
     completed_profile: Optional[CompletedProfile] = None
\ No newline at end of file
@@ -1,3 +1,6 @@
+import asyncio
+import functools
+import threading
 from typing import List, Dict, Tuple
 import numpy as np
 from compass_schemas import (
@@ -7,22 +10,61 @@ from compass_schemas import (
     JourneyState
 )
 
+# The twelve career-motivator dimensions tracked by the response analyzer
+TOTAL_MOTIVATOR_TYPES = 12
+
 class ConfidenceScorerService:
     def __init__(self):
         self.min_signals_for_confidence = 3
         self.skip_penalty = 10.0
         self.recent_weight_factor = 1.2
+        # Reusable aggregation buffers, thread-local because
+        # acalculate_confidence fans the sub-calculations out to worker
+        # threads; avoids rebuilding dicts/lists on every response
+        self._local = threading.local()
         
     def calculate_confidence(self, journey_state: JourneyState) -> ConfidenceScore:
         # Calculate motivator confidence
         motivator_confidence = self._calculate_motivator_confidence(journey_state.analyses)
-        
+
         # Calculate interest confidence
         interest_confidence = self._calculate_interest_confidence(journey_state.analyses)
-        
+
         # Adjust for skipped questions
         skip_adjustment = self._calculate_skip_adjustment(journey_state.responses)
-        
+
+        return self._compose_score(
+            motivator_confidence,
+            interest_confidence,
+            skip_adjustment,
+            journey_state.current_question_number
+        )
+
+    async def acalculate_confidence(self, journey_state: JourneyState) -> ConfidenceScore:
+        """Async variant: runs the independent sub-calculations in worker threads.
+
+        On long journeys the pure-Python scans dominate; fanning them out keeps
+        the event loop free to progress other in-flight journeys.
+        """
+        motivator_confidence, interest_confidence, skip_adjustment = await asyncio.gather(
+            asyncio.to_thread(self._calculate_motivator_confidence, journey_state.analyses),
+            asyncio.to_thread(self._calculate_interest_confidence, journey_state.analyses),
+            asyncio.to_thread(self._calculate_skip_adjustment, journey_state.responses)
+        )
+        return self._compose_score(
+            motivator_confidence,
+            interest_confidence,
+            skip_adjustment,
+            journey_state.current_question_number
+        )
+
+    def _compose_score(
+        self,
+        motivator_confidence: float,
+        interest_confidence: float,
+        skip_adjustment: float,
+        questions_asked: int
+    ) -> ConfidenceScore:
         # Calculate overall confidence
         overall_confidence = self._calculate_overall_confidence(
             motivator_confidence, 
@@ -33,7 +75,7 @@ class ConfidenceScorerService:
         # Determine if ready to complete
         ready_to_complete = self._is_ready_to_complete(
             overall_confidence,
-            journey_state.current_question_number
+            questions_asked
         )
         
         # Identify remaining gaps
@@ -51,46 +93,65 @@ class ConfidenceScorerService:
         )
     
     def _calculate_motivator_confidence(self, analyses: List[ResponseAnalysis]) -> float:
-        # Track which motivators we've identified
-        identified_motivators = set()
-        total_possible_motivators = 12
-        
-        motivator_strengths = {}
-        
+        # Flatten signals once into parallel arrays (type code, strength) so the
+        # per-type statistics below run as grouped NumPy passes instead of a
+        # Python loop with one np.std kernel launch per motivator type
+        buffers = getattr(self._local, "motivator_buffers", None)
+        if buffers is None:
+            buffers = self._local.motivator_buffers = ({}, [], [])
+        type_codes, codes, strengths = buffers
+        type_codes.clear()
+        codes.clear()
+        strengths.clear()
         for analysis in analyses:
             for motivator in analysis.motivators:
-                identified_motivators.add(motivator.type)
-                
-                if motivator.type not in motivator_strengths:
-                    motivator_strengths[motivator.type] = []
-                motivator_strengths[motivator.type].append(motivator.strength)
-        
+                code = type_codes.setdefault(motivator.type, len(type_codes))
+                codes.append(code)
+                strengths.append(motivator.strength)
+
+        identified_count = len(type_codes)
+
         # Calculate coverage
-        coverage = len(identified_motivators) / total_possible_motivators * 100
-        
-        # Calculate consistency (how consistent are the strengths for each motivator)
-        consistency_scores = []
-        for strengths in motivator_strengths.values():
-            if len(strengths) > 1:
-                # Lower std deviation = higher consistency
-                std_dev = np.std(strengths)
-                consistency = max(0, 100 - (std_dev * 20))
-                consistency_scores.append(consistency)
-        
-        avg_consistency = np.mean(consistency_scores) if consistency_scores else 50
-        
+        coverage = identified_count / TOTAL_MOTIVATOR_TYPES * 100
+
+        # Calculate consistency (how consistent are the strengths for each
+        # motivator): grouped mean/variance in one vectorized pass
+        if codes:
+            code_arr = np.asarray(codes)
+            strength_arr = np.asarray(strengths, dtype=np.float64)
+            counts = np.bincount(code_arr)
+            sums = np.bincount(code_arr, weights=strength_arr)
+            sum_squares = np.bincount(code_arr, weights=strength_arr * strength_arr)
+            repeated = counts > 1
+        else:
+            repeated = np.zeros(0, dtype=bool)
+
+        if repeated.any():
+            repeated_counts = counts[repeated]
+            means = sums[repeated] / repeated_counts
+            variances = np.maximum(sum_squares[repeated] / repeated_counts - means * means, 0)
+            # Lower std deviation = higher consistency
+            consistency_scores = np.maximum(0, 100 - np.sqrt(variances) * 20)
+            avg_consistency = consistency_scores.mean()
+        else:
+            avg_consistency = 50
+
         # Combine coverage and consistency
         confidence = (coverage * 0.6) + (avg_consistency * 0.4)
-        
+
         # Need at least 5 motivators identified for decent confidence
-        if len(identified_motivators) < 5:
-            confidence *= (len(identified_motivators) / 5)
-        
+        if identified_count < 5:
+            confidence *= (identified_count / 5)
+
         return min(confidence, 100)
     
     def _calculate_interest_confidence(self, analyses: List[ResponseAnalysis]) -> float:
-        # Track interests and their frequencies
-        interest_categories = {}
+        # Track interests and their frequencies in a reused buffer
+        interest_categories = getattr(self._local, "interest_accum", None)
+        if interest_categories is None:
+            interest_categories = self._local.interest_accum = {}
+        else:
+            interest_categories.clear()
         total_interests = 0
         
         for analysis in analyses:
@@ -106,15 +167,17 @@ class ConfidenceScorerService:
         # Calculate diversity (number of different categories)
         diversity = len(interest_categories)
         
-        # Calculate depth (average enthusiasm and count per category)
+        # Calculate depth (average enthusiasm and count per category).
+        # Plain-Python sums: these lists hold <10 elements, where NumPy's
+        # per-call dispatch overhead costs more than the arithmetic itself
         depth_scores = []
         for category, enthusiasms in interest_categories.items():
-            avg_enthusiasm = np.mean(enthusiasms)
+            avg_enthusiasm = sum(enthusiasms) / len(enthusiasms)
             count_factor = min(len(enthusiasms) / 3, 1.0)  # Normalize by expecting 3 mentions
             depth = avg_enthusiasm * 10 * count_factor
             depth_scores.append(depth)
         
-        avg_depth = np.mean(depth_scores) if depth_scores else 0
+        avg_depth = sum(depth_scores) / len(depth_scores) if depth_scores else 0
         
         # Combine diversity and depth
         # We want at least 3-5 different interest categories
@@ -156,15 +219,9 @@ class ConfidenceScorerService:
         return min(adjusted_confidence, 100)
     
     def _is_ready_to_complete(self, overall_confidence: float, questions_asked: int) -> bool:
-        # Decision logic based on confidence and questions asked
-        if questions_asked >= 12 and overall_confidence >= 85:
-            return True
-        elif questions_asked >= 15 and overall_confidence >= 75:
-            return True
-        elif questions_asked >= 18:  # Max with clarifications
-            return True
-        else:
-            return False
+        # Both inputs are small-range integers once truncated, so the memo
+        # table stays tiny; the expression itself is a single short-circuit
+        return _ready_to_complete(int(overall_confidence), questions_asked)
     
     def _identify_gaps(
         self,
@@ -181,4 +238,14 @@ class ConfidenceScorerService:
         if interest_confidence < 60:
             gaps.append(f"Personal interests (confidence: {interest_confidence:.0f}%)")
         
-        return gaps
\ No newline at end of file
+        return gaps
+
+@functools.cache
+def _ready_to_complete(overall_confidence: int, questions_asked: int) -> bool:
+    # Decision logic based on confidence and questions asked;
+    # 18 is the max with clarifications
+    return (
+        questions_asked >= 18
+        or (questions_asked >= 15 and overall_confidence >= 75)
+        or (questions_asked >= 12 and overall_confidence >= 85)
+    )
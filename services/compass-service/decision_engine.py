@@ -5,6 +5,57 @@ from compass_schemas import (
     JourneyState
 )
 from typing import Optional
+import functools
+
+# Precomputed decision table: one lookup instead of re-walking the threshold
+# ladder on every response. Key is phase*100 + band*10 + clar_bucket, where
+# phase buckets questions_asked against min/standard, band buckets overall
+# confidence against the acceptable/high thresholds, and clar_bucket is 0
+# while clarifications remain. The third element names how next_focus is
+# derived ("next_focus", "confirm", "gaps2", "gap1" or None).
+_T_EARLY = (DecisionType.COMPLETE, "High confidence achieved ({conf}) after {questions} questions", None)
+_T_CONTINUE = (DecisionType.CONTINUE, "Continuing assessment (question {next_question}/15, confidence: {conf})", "next_focus")
+_T_CONTINUE_HIGH = (DecisionType.CONTINUE, "Confidence is high ({conf}) but gathering additional data", "confirm")
+_T_STANDARD_DONE = (DecisionType.COMPLETE, "Standard assessment complete with good confidence ({conf})", None)
+_T_CLARIFY_GAPS = (DecisionType.CLARIFY, "Confidence at {conf} - clarifying key gaps", "gaps2")
+_T_AVAILABLE = (DecisionType.COMPLETE, "Completing with available data (confidence: {conf})", None)
+_T_MAX_CLAR = (DecisionType.COMPLETE, "Maximum clarifications reached - completing with {conf} confidence", None)
+_T_ACCEPTABLE = (DecisionType.COMPLETE, "Acceptable confidence achieved ({conf}) after clarifications", None)
+_T_USE_CLAR = (DecisionType.CLARIFY, "Using clarification {next_clarification}/{max_clarifications} to improve confidence", "gap1")
+
+# Gap-substring -> conversational focus, scanned once over the lowercased gap.
+# (The RIASEC tokens this once held are gone along with RIASEC itself.)
+FOCUS_MAP = (
+    ("motivators", "Identifying key career drivers and values"),
+    ("interests", "Discovering specific areas of enthusiasm"),
+)
+
+DECISION_TABLE = {}
+for _band in (0, 1, 2):
+    for _clar in (0, 1):
+        # Phase 0: before min_questions
+        DECISION_TABLE[_band * 10 + _clar] = _T_CONTINUE_HIGH if _band == 2 else _T_CONTINUE
+        # Phase 1: min_questions reached, before standard_questions
+        DECISION_TABLE[100 + _band * 10 + _clar] = _T_EARLY if _band == 2 else _T_CONTINUE
+        # Phase 2: at standard_questions
+        if _band == 2:
+            _entry = _T_EARLY
+        elif _band == 1:
+            _entry = _T_STANDARD_DONE
+        else:
+            _entry = _T_CLARIFY_GAPS if _clar == 0 else _T_AVAILABLE
+        DECISION_TABLE[200 + _band * 10 + _clar] = _entry
+        # Phase 3: clarification rounds past standard_questions
+        if _band == 2:
+            _entry = _T_EARLY
+        elif _clar == 1:
+            _entry = _T_MAX_CLAR
+        elif _band == 1:
+            _entry = _T_ACCEPTABLE
+        else:
+            _entry = _T_USE_CLAR
+        DECISION_TABLE[300 + _band * 10 + _clar] = _entry
+del _band, _clar, _entry
 
 class DecisionEngineService:
     def __init__(self):
@@ -25,9 +76,9 @@ class DecisionEngineService:
         clarifications_used = journey_state.clarifications_used
         overall_confidence = confidence_score.overall_confidence
         
-        # Check for abandonment signals (too many skips)
-        skip_rate = self._calculate_skip_rate(journey_state)
-        if skip_rate > 0.5 and questions_asked >= 5:
+        # Check for abandonment signals (too many skips); the cheap count
+        # guard runs first so early questions skip the rate check entirely
+        if questions_asked >= 5 and self._calculate_skip_rate(journey_state) > 0.5:
             return self._create_save_partial_decision(
                 confidence_score,
                 "High skip rate detected - saving partial profile"
@@ -55,113 +106,60 @@ class DecisionEngineService:
         overall_confidence: float,
         confidence_score: ConfidenceScore
     ) -> tuple[DecisionType, str, Optional[str]]:
-        
-        # Early completion scenario - high confidence achieved early
-        if questions_asked >= self.min_questions and overall_confidence >= self.high_confidence_threshold:
-            return (
-                DecisionType.COMPLETE,
-                f"High confidence achieved ({overall_confidence:.0f}%) after {questions_asked} questions",
-                None
-            )
-        
-        # Standard flow - haven't reached 15 questions yet
-        if questions_asked < self.standard_questions:
-            if overall_confidence < self.high_confidence_threshold:
-                next_focus = self._identify_next_focus(confidence_score)
-                return (
-                    DecisionType.CONTINUE,
-                    f"Continuing assessment (question {questions_asked + 1}/15, confidence: {overall_confidence:.0f}%)",
-                    next_focus
-                )
-            else:
-                # High confidence but let's get a bit more data
-                return (
-                    DecisionType.CONTINUE,
-                    f"Confidence is high ({overall_confidence:.0f}%) but gathering additional data",
-                    "Confirming strong signals and exploring edge cases"
-                )
-        
-        # Reached 15 questions - decision point
-        if questions_asked == self.standard_questions:
-            if overall_confidence >= self.acceptable_confidence_threshold:
-                return (
-                    DecisionType.COMPLETE,
-                    f"Standard assessment complete with good confidence ({overall_confidence:.0f}%)",
-                    None
-                )
-            elif clarifications_used < self.max_clarifications:
-                gaps = confidence_score.gaps_remaining[:2]  # Focus on top 2 gaps
-                return (
-                    DecisionType.CLARIFY,
-                    f"Confidence at {overall_confidence:.0f}% - clarifying key gaps",
-                    f"Clarifying: {', '.join(gaps) if gaps else 'lowest confidence areas'}"
-                )
-            else:
-                return (
-                    DecisionType.COMPLETE,
-                    f"Completing with available data (confidence: {overall_confidence:.0f}%)",
-                    None
-                )
-        
-        # In clarification phase (questions 16-18)
-        if questions_asked > self.standard_questions:
-            if clarifications_used >= self.max_clarifications:
-                return (
-                    DecisionType.COMPLETE,
-                    f"Maximum clarifications reached - completing with {overall_confidence:.0f}% confidence",
-                    None
-                )
-            elif overall_confidence >= self.acceptable_confidence_threshold:
-                return (
-                    DecisionType.COMPLETE,
-                    f"Acceptable confidence achieved ({overall_confidence:.0f}%) after clarifications",
-                    None
-                )
-            else:
-                remaining_clarifications = self.max_clarifications - clarifications_used
-                if remaining_clarifications > 0:
-                    next_gap = confidence_score.gaps_remaining[0] if confidence_score.gaps_remaining else "general clarity"
-                    return (
-                        DecisionType.CLARIFY,
-                        f"Using clarification {clarifications_used + 1}/{self.max_clarifications} to improve confidence",
-                        f"Focusing on: {next_gap}"
-                    )
-                else:
-                    return (
-                        DecisionType.COMPLETE,
-                        f"Completing assessment with {overall_confidence:.0f}% confidence",
-                        None
-                    )
-        
-        # Fallback - should not reach here in normal flow
-        return (
-            DecisionType.COMPLETE,
-            f"Assessment complete (confidence: {overall_confidence:.0f}%)",
-            None
+        if questions_asked < self.min_questions:
+            phase = 0
+        elif questions_asked < self.standard_questions:
+            phase = 1
+        elif questions_asked == self.standard_questions:
+            phase = 2
+        else:
+            phase = 3
+        if overall_confidence >= self.high_confidence_threshold:
+            band = 2
+        elif overall_confidence >= self.acceptable_confidence_threshold:
+            band = 1
+        else:
+            band = 0
+        clar_bucket = 0 if clarifications_used < self.max_clarifications else 1
+
+        decision_type, template, focus_kind = DECISION_TABLE[phase * 100 + band * 10 + clar_bucket]
+        # Format the confidence percentage once; it appears in most templates
+        conf_str = f"{overall_confidence:.0f}%"
+        reasoning = template.format(
+            conf=conf_str,
+            questions=questions_asked,
+            next_question=questions_asked + 1,
+            next_clarification=clarifications_used + 1,
+            max_clarifications=self.max_clarifications
         )
-    
+
+        if focus_kind == "next_focus":
+            next_focus = self._identify_next_focus(confidence_score)
+        elif focus_kind == "confirm":
+            next_focus = "Confirming strong signals and exploring edge cases"
+        elif focus_kind == "gaps2":
+            gaps = confidence_score.gaps_remaining[:2]  # Focus on top 2 gaps
+            next_focus = f"Clarifying: {', '.join(gaps) if gaps else 'lowest confidence areas'}"
+        elif focus_kind == "gap1":
+            next_gap = confidence_score.gaps_remaining[0] if confidence_score.gaps_remaining else "general clarity"
+            next_focus = f"Focusing on: {next_gap}"
+        else:
+            next_focus = None
+
+        return decision_type, reasoning, next_focus
+
     def _calculate_skip_rate(self, journey_state: JourneyState) -> float:
+        # skipped_count is maintained at ingest, so this is O(1) instead of
+        # rescanning the whole response list per decision
         if not journey_state.responses:
             return 0.0
-        
-        skipped = sum(1 for r in journey_state.responses if r.skipped)
-        return skipped / len(journey_state.responses)
+        return journey_state.skipped_count / len(journey_state.responses)
     
     def _identify_next_focus(self, confidence_score: ConfidenceScore) -> str:
         # Identify what to focus on next based on gaps
         if not confidence_score.gaps_remaining:
             return "Exploring general career preferences"
-        
-        # Take the most critical gap
-        primary_gap = confidence_score.gaps_remaining[0]
-        
-        # Make it more conversational
-        if "motivators" in primary_gap.lower():
-            return "Identifying key career drivers and values"
-        elif "interests" in primary_gap.lower():
-            return "Discovering specific areas of enthusiasm"
-        else:
-            return primary_gap
+        return _focus_for_gap(confidence_score.gaps_remaining[0])
     
     def _create_save_partial_decision(
         self,
@@ -173,4 +171,17 @@ class DecisionEngineService:
             reasoning=reason,
             next_focus=None,
             confidence_score=confidence_score
-        )
\ No newline at end of file
+        )
+
+@functools.lru_cache(maxsize=128)
+def _focus_for_gap(primary_gap: str) -> str:
+    """Map a gap description to a conversational focus.
+
+    Pure function over a tiny vocabulary of gap strings, so the LRU cache
+    hits nearly always after warmup and skips the substring scans.
+    """
+    primary_gap_lower = primary_gap.lower()
+    for token, focus in FOCUS_MAP:
+        if token in primary_gap_lower:
+            return focus
+    return primary_gap
@@ -1,11 +1,14 @@
 """Compass Microservice - Career Discovery Module"""
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from contextlib import asynccontextmanager
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
+import asyncio
 import os
 import sys
 from pathlib import Path
 from dotenv import load_dotenv
+import logging
 from typing import Optional
 from datetime import datetime
 import json
@@ -28,52 +31,66 @@ from compass_orchestrator import CompassOrchestrator
 
 load_dotenv()
 
-# Global instances
-app_state = {}
+logger = logging.getLogger(__name__)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     redis_client = await get_redis_client()
+    raw_redis_client = await get_redis_client(decode_responses=False)
     openai_client = get_openai_client()
-    
-    app_state["redis"] = redis_client
-    app_state["openai"] = openai_client
-    app_state["service_registry"] = ServiceRegistry(redis_client)
-    app_state["event_publisher"] = EventPublisher(redis_client)
-    app_state["orchestrator"] = CompassOrchestrator(
+
+    app.state.redis = redis_client
+    app.state.openai = openai_client
+    app.state.service_registry = ServiceRegistry()
+    app.state.event_publisher = EventPublisher(redis_client)
+    app.state.orchestrator = CompassOrchestrator(
         openai_client=openai_client,
         redis_client=redis_client,
-        event_publisher=app_state["event_publisher"]
+        event_publisher=app.state.event_publisher,
+        batch_synthesis=os.getenv("COMPASS_BATCH_SYNTHESIS", "").lower() in ("1", "true", "yes"),
+        raw_redis_client=raw_redis_client
     )
-    
+
     # Register this service
-    await app_state["service_registry"].register_service(
+    await app.state.service_registry.register_service(
         "compass-service",
         os.getenv("COMPASS_HOST", "localhost"),
         int(os.getenv("COMPASS_PORT", "8001")),
         "/health"
     )
-    
+
     yield
-    
+
     # Shutdown
-    await app_state["service_registry"].deregister_service("compass-service")
+    await app.state.service_registry.deregister_service("compass-service")
     await redis_client.close()
+    await raw_redis_client.close()
 
 app = FastAPI(
     title="Compass Service",
     description="AI-powered career discovery microservice",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
-# Dependencies
-def get_orchestrator() -> CompassOrchestrator:
-    return app_state["orchestrator"]
+# Keep strong references to fire-and-forget publish tasks until they finish
+_background_tasks: set = set()
 
-def get_event_publisher() -> EventPublisher:
-    return app_state["event_publisher"]
+def _publish_in_background(publisher: EventPublisher, channel: str, event: dict):
+    """Publish an event without blocking the HTTP response on the Redis RTT"""
+    task = asyncio.create_task(publisher.publish(channel, event))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+# Dependencies - attribute access on app.state avoids the shared module-global
+# dict pattern that breaks under multi-worker reloads
+def get_orchestrator(request: Request) -> CompassOrchestrator:
+    return request.app.state.orchestrator
+
+def get_event_publisher(request: Request) -> EventPublisher:
+    return request.app.state.event_publisher
 
 # Health check
 @app.get("/health")
@@ -96,8 +113,8 @@ async def start_journey(
     try:
         journey_state = await orchestrator.start_journey(request)
         
-        # Publish event for other services
-        await publisher.publish("compass.journey.started", {
+        # Publish event for other services, off the request path
+        _publish_in_background(publisher, "compass.journey.started", {
             "event_type": "journey_started",
             "service_origin": "compass-service",
             "user_id": request.user_id,
@@ -108,12 +125,15 @@ async def start_journey(
             }
         })
         
-        return journey_state.model_dump()
+        # ORJSONResponse serializes the model (datetimes included) natively;
+        # no model_dump + re-encode round-trip
+        return journey_state
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/journey/{journey_id}")
 async def get_journey(
+    request: Request,
     journey_id: str,
     orchestrator: CompassOrchestrator = Depends(get_orchestrator)
 ):
@@ -121,7 +141,12 @@ async def get_journey(
     journey_state = await orchestrator.get_journey_state(journey_id)
     if not journey_state:
         raise HTTPException(status_code=404, detail="Journey not found")
-    return journey_state.model_dump()
+
+    # Let pollers skip the body (and its serialization) when nothing changed
+    etag = f'"{journey_id}:{journey_state.version}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304)
+    return ORJSONResponse(journey_state.model_dump(mode="json"), headers={"ETag": etag})
 
 @app.post("/journey/{journey_id}/next-question")
 async def get_next_question(
@@ -130,32 +155,26 @@ async def get_next_question(
 ):
     """Generate next question"""
     try:
-        question = await orchestrator.generate_next_question(journey_id)
-        # Sanitize response to remove any RAISEC-related content
-        payload = question.model_dump()
-        # Remove riasec_weights from options if present
-        if "options" in payload and isinstance(payload["options"], list):
-            for opt in payload["options"]:
-                if isinstance(opt, dict):
-                    opt.pop("riasec_weights", None)
-        # Remove any mention of 'riasec' in target dimensions if present
-        td = payload.get("target_dimensions")
-        if isinstance(td, dict):
-            if isinstance(td.get("secondary_dimensions"), list):
-                td["secondary_dimensions"] = [d for d in td["secondary_dimensions"] if d.lower() != "riasec"]
-            if isinstance(td.get("primary_dimension"), str) and td["primary_dimension"].lower() == "riasec":
-                td["primary_dimension"] = "interests_motivators"
-        return payload
+        # No post-hoc sanitization: OptionTarget/QuestionTarget have no RIASEC
+        # fields and forbid extras, and the generator strips any RIASEC content
+        # from the LLM output before the model is built
+        return await orchestrator.generate_next_question(journey_id)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
 class ResponseSubmission(BaseModel):
+    # Allocated per /respond call: frozen + forbid lets pydantic skip
+    # assignment machinery and reject junk fields up front
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     question_id: str
     response_text: str
     response_time_seconds: Optional[int] = None
     skipped: bool = False
 
 class ProfileUpdateRequest(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     current_confidence: Optional[ConfidenceScore] = None
     reason: Optional[str] = None  # Why the user is updating
 
@@ -167,13 +186,10 @@ async def submit_response(
     publisher: EventPublisher = Depends(get_event_publisher)
 ):
     """Submit response to a question"""
-    import logging
-    logger = logging.getLogger(__name__)
-    
     try:
         logger.info(f"Processing response for journey {journey_id}, question {response_data.question_id}")
         
-        decision = await orchestrator.process_response(
+        decision, completed_profile = await orchestrator.process_response(
             journey_id=journey_id,
             question_id=response_data.question_id,
             response_text=response_data.response_text,
@@ -181,16 +197,12 @@ async def submit_response(
             skipped=response_data.skipped
         )
         
-        # If journey completed, publish profile component
-        if decision.decision == "complete":
-            journey_state = await orchestrator.get_journey_state(journey_id)
-            if journey_state.completed_profile:
-                await _publish_profile_component(
-                    journey_state.completed_profile,
-                    publisher
-                )
+        # If journey completed, publish the profile the orchestrator already
+        # built - no re-load of the journey state
+        if completed_profile:
+            _publish_profile_component(completed_profile, publisher)
         
-        return decision.model_dump()
+        return decision
     except ValueError as e:
         logger.error(f"ValueError in submit_response: {str(e)}")
         raise HTTPException(status_code=404, detail=str(e))
@@ -207,16 +219,37 @@ async def complete_journey(
     """Complete journey and get profile"""
     try:
         profile = await orchestrator.complete_journey(journey_id)
-        
-        # Publish profile component for aggregation
-        await _publish_profile_component(profile, publisher)
-        
-        return profile.model_dump()
+
+        if profile is None:
+            # Batch synthesis: the journey is parked in AWAITING_SYNTHESIS
+            # and the profile arrives out of band, so there is nothing to
+            # publish or return yet
+            return ORJSONResponse(
+                status_code=202,
+                content={"status": "awaiting_synthesis", "journey_id": journey_id}
+            )
+
+        # Publish profile component for aggregation, off the request path
+        _publish_profile_component(profile, publisher)
+
+        return profile
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
+@app.post("/journey/{journey_id}/complete/stream")
+async def complete_journey_stream(
+    journey_id: str,
+    orchestrator: CompassOrchestrator = Depends(get_orchestrator)
+):
+    """Complete journey, streaming progress and the profile over SSE"""
+    return StreamingResponse(
+        orchestrator.complete_journey_stream(journey_id),
+        media_type="text/event-stream"
+    )
+
 @app.get("/profile/{journey_id}")
 async def get_profile(
+    request: Request,
     journey_id: str,
     orchestrator: CompassOrchestrator = Depends(get_orchestrator)
 ):
@@ -224,11 +257,18 @@ async def get_profile(
     journey_state = await orchestrator.get_journey_state(journey_id)
     if not journey_state:
         raise HTTPException(status_code=404, detail="Journey not found")
-    
+
     if not journey_state.completed_profile:
         raise HTTPException(status_code=400, detail="Journey not completed")
-    
-    return journey_state.completed_profile.model_dump()
+
+    # Completed profiles are immutable, so clients can cache them outright
+    etag = f'"{journey_id}:{journey_state.version}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304)
+    return ORJSONResponse(
+        journey_state.completed_profile.model_dump(mode="json"),
+        headers={"ETag": etag, "Cache-Control": "private, max-age=3600"}
+    )
 
 @app.post("/journey/{journey_id}/update-profile")
 async def update_journey_profile(
@@ -254,8 +294,8 @@ async def update_journey_profile(
         # Save updated state
         await orchestrator._save_journey_state(journey_state)
         
-        # Publish update event
-        await publisher.publish("compass.profile.updated", {
+        # Publish update event off the request path
+        _publish_in_background(publisher, "compass.profile.updated", {
             "event_type": "profile_updated",
             "service_origin": "compass-service",
             "user_id": journey_state.user_id,
@@ -279,7 +319,7 @@ async def update_journey_profile(
         raise HTTPException(status_code=500, detail=str(e))
 
 # Helper function to publish profile component
-async def _publish_profile_component(
+def _publish_profile_component(
     profile: CompletedProfile,
     publisher: EventPublisher
 ):
@@ -297,12 +337,10 @@ async def _publish_profile_component(
         version="1.0"
     )
     
-    # Convert component to dict with JSON-safe datetime handling
-    component_dict = component.model_dump()
-    if 'generated_at' in component_dict and isinstance(component_dict['generated_at'], datetime):
-        component_dict['generated_at'] = component_dict['generated_at'].isoformat()
+    # mode="json" renders datetimes directly; no manual isoformat fixup
+    component_dict = component.model_dump(mode="json")
     
-    await publisher.publish("profile.component.ready", {
+    _publish_in_background(publisher, "profile.component.ready", {
         "event_type": "profile_component_ready",
         "service_origin": "compass-service",
         "user_id": profile.user_id,
@@ -312,4 +350,15 @@ async def _publish_profile_component(
 if __name__ == "__main__":
     import uvicorn
     port = int(os.getenv("COMPASS_PORT", "8001"))
-    uvicorn.run(app, host="0.0.0.0", port=port)
\ No newline at end of file
+    # uvloop + httptools cut event-loop overhead on every awaited hop.
+    # COMPASS_WORKERS > 1 forks one loop per core (state lives in lifespan,
+    # so each worker builds its own Redis/OpenAI clients); the app is passed
+    # as an import string because uvicorn ignores workers with an app object.
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=port,
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.getenv("COMPASS_WORKERS", "1"))
+    )
\ No newline at end of file
@@ -1,7 +1,10 @@
-import json
+import asyncio
+
+import orjson
+from math import fsum
+from operator import itemgetter
 from typing import List, Dict, Any, Tuple
 from datetime import datetime
-import numpy as np
 from openai import AsyncOpenAI
 from compass_schemas import (
     CompletedProfile,
@@ -10,27 +13,64 @@ from compass_schemas import (
     ResponseAnalysis
 )
 
+# Static synthesis instructions and output schema stay in the system message
+# so provider-side prompt caching hits on every call; per-journey assessment
+# data goes in the user message.
+SYNTHESIS_SYSTEM_PROMPT = """You are an expert career psychologist creating personalized insights.
+
+Synthesize a comprehensive career profile from the assessment data provided.
+
+Generate personalized insights that:
+1. Synthesize the overall career personality
+2. Identify key strengths based on the profile
+3. Describe the ideal work environment
+4. Suggest career directions (general, not specific jobs)
+5. Note unique combinations that stand out
+6. Identify potential blind spots or areas for growth
+
+Output as JSON:
+{
+  "summary": "2-3 sentence overview of their career personality",
+  "strengths": ["strength1", "strength2", "strength3", "strength4"],
+  "ideal_environment": "Description of ideal work environment in 2-3 sentences",
+  "career_direction": "General career guidance in 2-3 sentences",
+  "unique_combinations": ["unique aspect 1", "unique aspect 2"],
+  "potential_blind_spots": ["blind spot 1", "blind spot 2"]
+}
+
+Make insights specific to their profile, not generic. Reference their actual motivators and interests."""
+
+# Ordinal value of each response_quality label, accumulated per analysis by
+# _aggregate_analyses and reduced by _assess_overall_quality
+_QUALITY_SCORES = {"high": 3, "medium": 2, "low": 1}
+
 class ProfileSynthesizerService:
-    def __init__(self, openai_client: AsyncOpenAI):
+    def __init__(self, openai_client: AsyncOpenAI, llm_cache=None):
         self.client = openai_client
         self.model = "gpt-4-turbo-preview"
+        # Orchestrator-provided LLM result cache (L1 dict + Redis); insights
+        # are a deterministic-ish function of the categorical profile inputs,
+        # so recurring archetypes skip the completion call entirely
+        self.llm_cache = llm_cache
         
     async def synthesize_profile(self, journey_state: JourneyState) -> CompletedProfile:
-        # Organize motivators by priority
-        motivators = self._organize_motivators(journey_state.analyses)
-        
-        # Cluster interests
-        interests = self._cluster_interests(journey_state.analyses)
+        # One pass over the analyses feeds all downstream reducers
+        motivator_scores, interest_map, quality_total = self._aggregate_analyses(journey_state.analyses)
+        motivators = self._organize_motivators(motivator_scores)
+        interests = self._cluster_interests(interest_map)
         
         # Generate insights using GPT-4
         insights = await self._generate_insights(
             motivators,
             interests,
-            journey_state
+            journey_state,
+            self._assess_overall_quality(quality_total, len(journey_state.analyses))
         )
         
-        # Calculate journey metrics
-        journey_duration = (datetime.utcnow() - journey_state.start_time).total_seconds() / 60
+        # Calculate journey metrics; one utcnow() so the duration and the
+        # completion stamp agree
+        now = datetime.utcnow()
+        journey_duration = (now - journey_state.start_time).total_seconds() / 60
         
         return CompletedProfile(
             user_id=journey_state.user_id,
@@ -38,32 +78,69 @@ class ProfileSynthesizerService:
             motivators=motivators,
             interests=interests,
             insights=insights,
-            completion_date=datetime.utcnow(),
-            questions_answered=len([r for r in journey_state.responses if not r.skipped]),
+            completion_date=now,
+            questions_answered=sum(1 for r in journey_state.responses if not r.skipped),
             journey_duration_minutes=journey_duration,
             confidence_at_completion=journey_state.current_confidence.overall_confidence if journey_state.current_confidence else 0
         )
     
-    def _organize_motivators(self, analyses: List[ResponseAnalysis]) -> Dict[str, List[str]]:
-        # Aggregate all motivator signals
-        motivator_scores = {}
-        
+    async def synthesize_profiles_batch(
+        self,
+        journey_states: List[JourneyState],
+        max_concurrency: int = 32
+    ) -> List[CompletedProfile]:
+        """Synthesize many profiles concurrently.
+
+        The workload is network-bound (one chat-completion RTT each), so
+        submitting them together gives near-linear speedup; the semaphore
+        keeps the fan-out within the API tier's rate budget. Per-call
+        throttling on the live path stays with the orchestrator.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _run(journey_state: JourneyState) -> CompletedProfile:
+            async with semaphore:
+                return await self.synthesize_profile(journey_state)
+
+        return await asyncio.gather(*(_run(js) for js in journey_states))
+
+    def _aggregate_analyses(
+        self,
+        analyses: List[ResponseAnalysis]
+    ) -> Tuple[Dict[str, List[float]], Dict[str, List[float]], int]:
+        """Collect every per-analysis signal in a single traversal.
+
+        The motivator ranking, interest clustering and quality assessment all
+        reduce over `analyses`; doing the iteration once here instead of once
+        per helper keeps profile finalization to one pass of attribute
+        dispatch. Returns (motivator scores, interest enthusiasm, quality
+        total) keyed by motivator type and "category: specific" respectively.
+        """
+        motivator_scores: Dict[str, List[float]] = {}
+        interest_map: Dict[str, List[float]] = {}
+        quality_total = 0
         for analysis in analyses:
             for motivator in analysis.motivators:
-                if motivator.type not in motivator_scores:
-                    motivator_scores[motivator.type] = []
-                
                 # Weight by confidence and strength
                 score = motivator.strength * (motivator.confidence / 100)
-                motivator_scores[motivator.type].append(score)
-        
-        # Calculate average scores
+                motivator_scores.setdefault(motivator.type, []).append(score)
+            for interest in analysis.interests:
+                key = f"{interest.category}: {interest.specific}"
+                interest_map.setdefault(key, []).append(interest.enthusiasm)
+            quality_total += _QUALITY_SCORES.get(analysis.response_quality, 1)
+        return motivator_scores, interest_map, quality_total
+
+    def _organize_motivators(self, motivator_scores: Dict[str, List[float]]) -> Dict[str, List[str]]:
+        # Calculate average scores; plain-Python fsum because these lists
+        # hold 1-5 floats, where NumPy dispatch costs more than the math
         motivator_averages = {}
         for motivator_type, scores in motivator_scores.items():
-            motivator_averages[motivator_type] = np.mean(scores)
+            motivator_averages[motivator_type] = fsum(scores) / len(scores)
         
-        # Sort by average score
-        sorted_motivators = sorted(motivator_averages.items(), key=lambda x: x[1], reverse=True)
+        # Sort by average score. Every element's rank is consumed by the
+        # top/moderate/low partition below, so a partial top-K selection
+        # can't replace the sort; itemgetter keeps the comparator in C.
+        sorted_motivators = sorted(motivator_averages.items(), key=itemgetter(1), reverse=True)
         
         # Categorize into top, moderate, and low
         total = len(sorted_motivators)
@@ -79,24 +156,15 @@ class ProfileSynthesizerService:
             "low": [m[0] for m in sorted_motivators[moderate_threshold:]]
         }
     
-    def _cluster_interests(self, analyses: List[ResponseAnalysis]) -> Dict[str, List[str]]:
-        # Collect all interests with their enthusiasm scores
-        interest_map = {}
-        
-        for analysis in analyses:
-            for interest in analysis.interests:
-                key = f"{interest.category}: {interest.specific}"
-                if key not in interest_map:
-                    interest_map[key] = []
-                interest_map[key].append(interest.enthusiasm)
-        
+    def _cluster_interests(self, interest_map: Dict[str, List[float]]) -> Dict[str, List[str]]:
         # Calculate average enthusiasm for each interest
         interest_scores = {}
         for interest, scores in interest_map.items():
-            interest_scores[interest] = np.mean(scores)
+            interest_scores[interest] = fsum(scores) / len(scores)
         
-        # Sort by enthusiasm
-        sorted_interests = sorted(interest_scores.items(), key=lambda x: x[1], reverse=True)
+        # Sort by enthusiasm; the primary/secondary/emerging walk consumes
+        # the full ranking, so only the comparator is worth optimizing
+        sorted_interests = sorted(interest_scores.items(), key=itemgetter(1), reverse=True)
         
         # Categorize
         if not sorted_interests:
@@ -121,33 +189,91 @@ class ProfileSynthesizerService:
             "emerging": emerging[:3]
         }
     
+    def assemble_profile(self, journey_state: JourneyState, insights: ProfileInsights) -> CompletedProfile:
+        """Assemble a CompletedProfile around already-generated insights.
+
+        Used by the Batch API path, where the insight completion arrives
+        asynchronously instead of from a live call.
+        """
+        motivator_scores, interest_map, _ = self._aggregate_analyses(journey_state.analyses)
+        now = datetime.utcnow()
+        journey_duration = (now - journey_state.start_time).total_seconds() / 60
+        return CompletedProfile(
+            user_id=journey_state.user_id,
+            journey_id=journey_state.journey_id,
+            motivators=self._organize_motivators(motivator_scores),
+            interests=self._cluster_interests(interest_map),
+            insights=insights,
+            completion_date=now,
+            questions_answered=sum(1 for r in journey_state.responses if not r.skipped),
+            journey_duration_minutes=journey_duration,
+            confidence_at_completion=journey_state.current_confidence.overall_confidence if journey_state.current_confidence else 0
+        )
+
+    def build_insights_request(self, journey_state: JourneyState) -> Dict[str, Any]:
+        """Build the chat-completions payload for insight synthesis.
+
+        Shared by the live path and the Batch API path (the orchestrator's
+        submit_insights_batch / _finalize_batch pair, which uploads these as
+        JSONL to /v1/batches at ~50% cost) so both send identical requests.
+        """
+        motivator_scores, interest_map, quality_total = self._aggregate_analyses(journey_state.analyses)
+        prompt = self._build_insights_prompt(
+            self._organize_motivators(motivator_scores),
+            self._cluster_interests(interest_map),
+            journey_state,
+            self._assess_overall_quality(quality_total, len(journey_state.analyses))
+        )
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": SYNTHESIS_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": 0,
+            "top_p": 1,
+            "response_format": {"type": "json_object"}
+        }
+
     async def _generate_insights(
         self,
         motivators: Dict[str, List[str]],
         interests: Dict[str, List[str]],
-        journey_state: JourneyState
+        journey_state: JourneyState,
+        quality_summary: str
     ) -> ProfileInsights:
-        
+
         # Prepare context for GPT-4
         prompt = self._build_insights_prompt(
             motivators,
             interests,
-            journey_state
+            journey_state,
+            quality_summary
         )
-        
+
+        cache_key = None
+        if self.llm_cache is not None:
+            cache_key = self.llm_cache.key({"fn": "generate_insights", "model": self.model, "prompt": prompt})
+            cached = await self.llm_cache.get(cache_key)
+            if cached:
+                return ProfileInsights.model_validate_json(cached)
+
         response = await self.client.chat.completions.create(
             model=self.model,
             messages=[
-                {"role": "system", "content": "You are an expert career psychologist creating personalized insights."},
+                {"role": "system", "content": SYNTHESIS_SYSTEM_PROMPT},
                 {"role": "user", "content": prompt}
             ],
-            temperature=0.7,
+            # Deterministic: synthesis restates already-computed facts, and
+            # temperature 0 makes identical profiles reuse the cached result
+            temperature=0,
+            top_p=1,
             response_format={"type": "json_object"}
         )
         
-        result = json.loads(response.choices[0].message.content)
+        result = orjson.loads(response.choices[0].message.content)
         
-        return ProfileInsights(
+        insights = ProfileInsights(
             summary=result["summary"],
             strengths=result["strengths"],
             ideal_environment=result["ideal_environment"],
@@ -155,59 +281,34 @@ class ProfileSynthesizerService:
             unique_combinations=result["unique_combinations"],
             potential_blind_spots=result["potential_blind_spots"]
         )
+        if cache_key is not None:
+            await self.llm_cache.set(cache_key, insights.model_dump_json())
+        return insights
     
     def _build_insights_prompt(
         self,
         motivators: Dict[str, List[str]],
         interests: Dict[str, List[str]],
-        journey_state: JourneyState
+        journey_state: JourneyState,
+        quality_summary: str
     ) -> str:
-        
-        prompt = f"""Synthesize a comprehensive career profile based on this assessment data:
-
-Top Career Motivators: {', '.join(motivators.get('top', []))}
+        # Only the per-journey assessment data; instructions and schema live
+        # in the cached system prompt
+        return f"""Top Career Motivators: {', '.join(motivators.get('top', []))}
 Moderate Motivators: {', '.join(motivators.get('moderate', []))}
 
 Primary Interests: {', '.join(interests.get('primary', []))}
 Secondary Interests: {', '.join(interests.get('secondary', []))}
 
 Questions Answered: {len(journey_state.responses)}
-Response Quality: {self._assess_overall_quality(journey_state.analyses)}
+Response Quality: {quality_summary}"""
 
-Generate personalized insights that:
-1. Synthesize the overall career personality
-2. Identify key strengths based on the profile
-3. Describe the ideal work environment
-4. Suggest career directions (general, not specific jobs)
-5. Note unique combinations that stand out
-6. Identify potential blind spots or areas for growth
-
-Output as JSON:
-{{
-  "summary": "2-3 sentence overview of their career personality",
-  "strengths": ["strength1", "strength2", "strength3", "strength4"],
-  "ideal_environment": "Description of ideal work environment in 2-3 sentences",
-  "career_direction": "General career guidance in 2-3 sentences",
-  "unique_combinations": ["unique aspect 1", "unique aspect 2"],
-  "potential_blind_spots": ["blind spot 1", "blind spot 2"]
-}}
-
-Make insights specific to their profile, not generic. Reference their actual motivators and interests."""
-        
-        return prompt
-    
-    def _assess_overall_quality(self, analyses: List[ResponseAnalysis]) -> str:
-        if not analyses:
+    def _assess_overall_quality(self, quality_total: int, analysis_count: int) -> str:
+        """Reduce the quality total from _aggregate_analyses to a summary."""
+        if analysis_count == 0:
             return "unknown"
         
-        quality_scores = {
-            "high": 3,
-            "medium": 2,
-            "low": 1
-        }
-        
-        total_score = sum(quality_scores.get(a.response_quality, 1) for a in analyses)
-        avg_score = total_score / len(analyses)
+        avg_score = quality_total / analysis_count
         
         if avg_score >= 2.5:
             return "High quality responses overall"
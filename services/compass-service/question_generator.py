@@ -1,5 +1,6 @@
-import json
 import logging
+
+import orjson
 from typing import Optional, List, Dict, Any
 from openai import AsyncOpenAI
 from compass_schemas import (
@@ -16,11 +17,128 @@ from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Static instructions - including the ~2 KB option_targets exemplar - live
+# in this module constant, rendered exactly once at import, and go out as the
+# system message so provider-side prompt caching hits on every call;
+# per-journey details go in the user message. (OpenAI auto-caches stable
+# prefixes >= 1024 tokens.)
+GENERATION_SYSTEM_PROMPT = """You are an expert career counselor conducting a discovery session.
+
+Generate ONE engaging MCQ scenario per request.
+
+CRITICAL: Design a scenario with 4 response options that reveal career interests and motivators.
+
+**STRICT REQUIREMENTS:**
+- Do NOT include any RAISEC fields (e.g., riasec, riasec_weights, realistic, investigative, artistic, social, enterprising, conventional)
+- Focus ONLY on interests and motivators
+- Each option should contain 2-3 sentences of rich behavioral detail
+- Options should be equally appealing but show different preference patterns
+- Feel realistic for the user's age and an Indian context
+
+Each option should naturally reveal:
+- Career motivators (Autonomy, Achievement, Recognition, Growth, Stability, Purpose, Creativity, Challenge, Money, Team, Work-Life Balance)
+- Specific interests and activities (Technology, Business, Social Impact, Arts, Science, Education, Healthcare, Sports, Environment, Entertainment)
+
+Output as JSON with this EXACT structure (NO RAISEC FIELDS ALLOWED):
+{
+  "question": "engaging scenario question text",
+  "theme": "unique_theme_identifier",
+  "options": [
+    {"id": "A", "text": "detailed option text with behavioral details"},
+    {"id": "B", "text": "detailed option text with behavioral details"},
+    {"id": "C", "text": "detailed option text with behavioral details"},
+    {"id": "D", "text": "detailed option text with behavioral details"}
+  ],
+  "option_targets": [
+    {
+      "motivators": [
+        {"type": "autonomy", "weight": 0.8},
+        {"type": "money", "weight": 0.7}
+      ],
+      "interests": [
+        {"area": "technology", "weight": 0.8},
+        {"area": "entrepreneurship", "weight": 0.9}
+      ],
+      "confidence_impact": 7.0
+    },
+    {
+      "motivators": [
+        {"type": "growth", "weight": 0.8},
+        {"type": "purpose", "weight": 0.7}
+      ],
+      "interests": [
+        {"area": "research", "weight": 0.9},
+        {"area": "sustainability", "weight": 0.7}
+      ],
+      "confidence_impact": 7.0
+    },
+    {
+      "motivators": [
+        {"type": "creativity", "weight": 0.9},
+        {"type": "autonomy", "weight": 0.8}
+      ],
+      "interests": [
+        {"area": "arts", "weight": 0.9},
+        {"area": "travel", "weight": 0.7}
+      ],
+      "confidence_impact": 7.0
+    },
+    {
+      "motivators": [
+        {"type": "purpose", "weight": 0.9},
+        {"type": "team", "weight": 0.7}
+      ],
+      "interests": [
+        {"area": "social_impact", "weight": 0.9},
+        {"area": "community", "weight": 0.8}
+      ],
+      "confidence_impact": 7.0
+    }
+  ],
+  "context_note": "brief explanation of why this scenario is relevant"
+}
+
+REMEMBER: ABSOLUTELY NO RAISEC-RELATED CONTENT OR FIELDS. Focus exclusively on interests and motivators."""
+
+# Keyword tables for default option-target weights, flattened into one
+# module-level tuple of (category, type/area, keywords, per-hit increment)
+# so _analyze_option_targets neither rebuilds the dicts per call nor walks
+# motivators and interests in separate passes. Matching stays presence-based
+# (`in`): several keywords overlap across entries ('art'/'artistic',
+# 'creative', 'music'), so an occurrence-counting multi-pattern scan would
+# change the weights.
+_TARGET_KEYWORDS = tuple(
+    [("motivators", mtype, tuple(kws), 0.3) for mtype, kws in {
+        'autonomy': ['freedom', 'independent', 'own terms', 'flexible', 'self-directed'],
+        'achievement': ['accomplish', 'achieve', 'success', 'results', 'goals'],
+        'recognition': ['recognized', 'appreciated', 'reputation', 'respected'],
+        'growth': ['learn', 'develop', 'advance', 'progress', 'improve'],
+        'stability': ['stable', 'secure', 'predictable', 'consistent'],
+        'purpose': ['meaningful', 'impact', 'difference', 'contribute', 'purpose'],
+        'creativity': ['creative', 'innovative', 'novel', 'original', 'artistic'],
+        'challenge': ['challenging', 'complex', 'difficult', 'demanding'],
+        'money': ['financial', 'salary', 'compensation', 'earnings', 'income'],
+        'team': ['team', 'collaborate', 'together', 'group', 'collective'],
+        'work_life_balance': ['balance', 'family', 'personal time', 'flexibility', 'well-being']
+    }.items()]
+    + [("interests", area, tuple(kws), 0.2) for area, kws in {
+        'technology': ['tech', 'software', 'digital', 'computer', 'programming', 'coding', 'ai', 'machine learning'],
+        'business': ['business', 'startup', 'company', 'enterprise', 'commerce', 'trade'],
+        'social_impact': ['social', 'community', 'ngo', 'help', 'volunteer', 'charity', 'non-profit'],
+        'arts': ['art', 'creative', 'design', 'painting', 'music', 'dance', 'theater', 'writing'],
+        'science': ['science', 'research', 'experiment', 'discover', 'analyze', 'data'],
+        'education': ['teach', 'learn', 'education', 'school', 'university', 'knowledge'],
+        'healthcare': ['health', 'medical', 'doctor', 'nurse', 'hospital', 'wellness'],
+        'sports': ['sports', 'fitness', 'athlete', 'game', 'competition', 'exercise'],
+        'environment': ['environment', 'sustainability', 'climate', 'nature', 'eco-friendly'],
+        'entertainment': ['entertainment', 'media', 'film', 'tv', 'gaming', 'music']
+    }.items()]
+)
+
 class QuestionGeneratorService:
     def __init__(self, openai_client: AsyncOpenAI):
         self.client = openai_client
         self.model = "gpt-4-turbo-preview"
-        self.used_question_themes = set()  # Track used themes to prevent repetition
         
     async def generate_question(
         self,
@@ -45,21 +163,24 @@ class QuestionGeneratorService:
             question_number=question_number,
             is_clarification=is_clarification,
             target_dimensions=target_dimensions,
-            context=context
+            context=context,
+            used_themes=journey_state.used_question_themes
         )
         
         response = await self.client.chat.completions.create(
             model=self.model,
             messages=[
-                {"role": "system", "content": "You are an expert career counselor conducting a discovery session."},
+                {"role": "system", "content": GENERATION_SYSTEM_PROMPT},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.8,
             response_format={"type": "json_object"}
         )
         
-        result = json.loads(response.choices[0].message.content)
-        logger.debug(f"GPT-4 response: {json.dumps(result, indent=2)}")
+        result = orjson.loads(response.choices[0].message.content)
+        # Guard so the pretty-print only runs when debug logging is on
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("GPT-4 response: %s", orjson.dumps(result, option=orjson.OPT_INDENT_2).decode())
         
         # Validate and clean the response
         result = self._validate_and_clean_response(result)
@@ -86,15 +207,20 @@ class QuestionGeneratorService:
             option_targets.append(OptionTarget(
                 id=option_id,
                 text=option_text,
-                riasec_weights={},  # Empty since we're not using RIASEC
                 motivators=target.get('motivators', []),
                 interests=target.get('interests', []),
                 confidence_impact=target.get('confidence_impact', 5.0)
             ))
         
-        # Track question theme to prevent repetition
+        # Track question theme to prevent repetition. Themes live on the
+        # journey (a service-instance set would leak across users and grow
+        # without bound); the cap matches the standard journey length.
         question_theme = result.get("theme", question_text[:50])
-        self.used_question_themes.add(question_theme)
+        themes = journey_state.used_question_themes
+        if question_theme not in themes:
+            themes.append(question_theme)
+            if len(themes) > 15:
+                del themes[0]
         
         return GeneratedQuestion(
             question_id=str(uuid.uuid4()),
@@ -130,7 +256,10 @@ class QuestionGeneratorService:
                 recent_interests.extend([i.category for i in analysis.interests])
             
             if recent_interests:
-                unique_interests = list(set(recent_interests))
+                # dict.fromkeys dedups in first-seen order: set() order varies
+                # per process, which would reshuffle the prompt string and
+                # defeat both the LLM cache key and provider prefix caching
+                unique_interests = list(dict.fromkeys(recent_interests))
                 context_parts.append(f"Recent interests: {', '.join(unique_interests[:3])}")
         
         # Note motivators patterns if available
@@ -140,7 +269,7 @@ class QuestionGeneratorService:
                 recent_motivators.extend([m.type for m in analysis.motivators])
             
             if recent_motivators:
-                unique_motivators = list(set(recent_motivators))
+                unique_motivators = list(dict.fromkeys(recent_motivators))
                 context_parts.append(f"Emerging motivators: {', '.join(unique_motivators[:2])}")
         
         return " ".join(context_parts) if context_parts else "Building understanding of interests and motivators."
@@ -152,168 +281,75 @@ class QuestionGeneratorService:
         question_number: int,
         is_clarification: bool,
         target_dimensions: Dict[str, any],
-        context: str
+        context: str,
+        used_themes: List[str]
     ) -> str:
-        
+        # Only the per-journey variables. Prefix caching matches the request
+        # token-by-token from the start, so journey-stable lines (demographics,
+        # style) come first and per-question lines (number, themes, context)
+        # last - the cached prefix then extends past the system prompt into
+        # this message for every question after the first.
         style_instruction = "conversational and friendly" if preferences.question_style == "casual" else "professional and clear"
-        
-        # Get list of previously used themes to avoid repetition
-        avoid_themes = list(self.used_question_themes)[:5] if self.used_question_themes else []
+
+        # Most recent themes from this journey only, to avoid repetition
+        avoid_themes = used_themes[-5:]
         avoid_instruction = f"IMPORTANT: Create a UNIQUE scenario. DO NOT repeat these themes: {', '.join(avoid_themes)}" if avoid_themes else ""
-        
-        prompt = f"""Generate ONE engaging MCQ scenario for a {demographics.age}-year-old {demographics.current_status or 'person'}.
+
+        return f"""User: a {demographics.age}-year-old {demographics.current_status or 'person'}
+Question style: {style_instruction}
 
 Question #{question_number} of 15 {"(Clarification)" if is_clarification else ""}
 
 {avoid_instruction}
 
-CRITICAL: Design a scenario with 4 response options that reveal career interests and motivators.
+Journey context: {context}"""
 
-**STRICT REQUIREMENTS:**
-- Do NOT include any RAISEC fields (e.g., riasec, riasec_weights, realistic, investigative, artistic, social, enterprising, conventional)
-- Focus ONLY on interests and motivators
-- Each option should contain 2-3 sentences of rich behavioral detail
-- Options should be equally appealing but show different preference patterns
-- Feel realistic for a {demographics.age}-year-old Indian context
-
-Each option should naturally reveal:
-- Career motivators (Autonomy, Achievement, Recognition, Growth, Stability, Purpose, Creativity, Challenge, Money, Team, Work-Life Balance)
-- Specific interests and activities (Technology, Business, Social Impact, Arts, Science, Education, Healthcare, Sports, Environment, Entertainment)
+    # RAISEC fields to strip from LLM output; a frozenset so cleanup is one
+    # C-level keys() intersection per dict instead of eight membership checks
+    _RAISEC_KEYS = frozenset({
+        'riasec', 'realistic', 'investigative', 'artistic',
+        'social', 'enterprising', 'conventional', 'riasec_weights'
+    })
 
-Output as JSON with this EXACT structure (NO RAISEC FIELDS ALLOWED):
-{{
-  "question": "engaging scenario question text",
-  "theme": "unique_theme_identifier",
-  "options": [
-    {{"id": "A", "text": "detailed option text with behavioral details"}},
-    {{"id": "B", "text": "detailed option text with behavioral details"}},
-    {{"id": "C", "text": "detailed option text with behavioral details"}},
-    {{"id": "D", "text": "detailed option text with behavioral details"}}
-  ],
-  "option_targets": [
-    {{
-      "motivators": [
-        {{"type": "autonomy", "weight": 0.8}},
-        {{"type": "money", "weight": 0.7}}
-      ],
-      "interests": [
-        {{"area": "technology", "weight": 0.8}},
-        {{"area": "entrepreneurship", "weight": 0.9}}
-      ],
-      "confidence_impact": 7.0
-    }},
-    {{
-      "motivators": [
-        {{"type": "growth", "weight": 0.8}},
-        {{"type": "purpose", "weight": 0.7}}
-      ],
-      "interests": [
-        {{"area": "research", "weight": 0.9}},
-        {{"area": "sustainability", "weight": 0.7}}
-      ],
-      "confidence_impact": 7.0
-    }},
-    {{
-      "motivators": [
-        {{"type": "creativity", "weight": 0.9}},
-        {{"type": "autonomy", "weight": 0.8}}
-      ],
-      "interests": [
-        {{"area": "arts", "weight": 0.9}},
-        {{"area": "travel", "weight": 0.7}}
-      ],
-      "confidence_impact": 7.0
-    }},
-    {{
-      "motivators": [
-        {{"type": "purpose", "weight": 0.9}},
-        {{"type": "team", "weight": 0.7}}
-      ],
-      "interests": [
-        {{"area": "social_impact", "weight": 0.9}},
-        {{"area": "community", "weight": 0.8}}
-      ],
-      "confidence_impact": 7.0
-    }}
-  ],
-  "context_note": "brief explanation of why this scenario is relevant"
-}}
-
-REMEMBER: ABSOLUTELY NO RAISEC-RELATED CONTENT OR FIELDS. Focus exclusively on interests and motivators."""
-        
-        return prompt
-    
     def _validate_and_clean_response(self, response: Dict[str, Any]) -> Dict[str, Any]:
         """Validate and clean the GPT-4 response to remove any RAISEC content"""
-        raisec_keywords = [
-            'riasec', 'realistic', 'investigative', 'artistic', 
-            'social', 'enterprising', 'conventional', 'riasec_weights'
-        ]
-        
-        # Clean option_targets
+        # Clean option_targets, aggregating removals into one warning
+        removed = set()
         if 'option_targets' in response:
             for target in response['option_targets']:
                 # Remove any RAISEC fields that might have been included
-                for keyword in raisec_keywords:
-                    if keyword in target:
-                        del target[keyword]
-                        logger.warning(f"Removed RAISEC field '{keyword}' from option target")
-        
+                stale = target.keys() & self._RAISEC_KEYS
+                for keyword in stale:
+                    del target[keyword]
+                removed |= stale
+        if removed:
+            logger.warning("Removed RAISEC fields %s from option targets", sorted(removed))
+
         # Clean the main response
-        for keyword in raisec_keywords:
-            if keyword in response:
-                del response[keyword]
-                logger.warning(f"Removed RAISEC field '{keyword}' from main response")
-        
+        stale = response.keys() & self._RAISEC_KEYS
+        for keyword in stale:
+            del response[keyword]
+        if stale:
+            logger.warning("Removed RAISEC fields %s from main response", sorted(stale))
+
         return response
     
     def _analyze_option_targets(self, option_text: str) -> Dict[str, Any]:
         """Analyze option text to determine default target weights for interests and motivators only"""
-        
-        # Keywords for motivators
-        motivator_keywords = {
-            'autonomy': ['freedom', 'independent', 'own terms', 'flexible', 'self-directed'],
-            'achievement': ['accomplish', 'achieve', 'success', 'results', 'goals'],
-            'recognition': ['recognized', 'appreciated', 'reputation', 'respected'],
-            'growth': ['learn', 'develop', 'advance', 'progress', 'improve'],
-            'stability': ['stable', 'secure', 'predictable', 'consistent'],
-            'purpose': ['meaningful', 'impact', 'difference', 'contribute', 'purpose'],
-            'creativity': ['creative', 'innovative', 'novel', 'original', 'artistic'],
-            'challenge': ['challenging', 'complex', 'difficult', 'demanding'],
-            'money': ['financial', 'salary', 'compensation', 'earnings', 'income'],
-            'team': ['team', 'collaborate', 'together', 'group', 'collective'],
-            'work_life_balance': ['balance', 'family', 'personal time', 'flexibility', 'well-being']
-        }
-        
         option_lower = option_text.lower()
-        
-        # Calculate motivator weights
+
+        # Single pass over the precompiled table; each `in` check is one
+        # C-level substring scan, with no per-call dict construction
         motivators = []
-        for motivator_type, keywords in motivator_keywords.items():
-            weight = sum(1 for keyword in keywords if keyword in option_lower) * 0.3
-            if weight > 0:
-                motivators.append({'type': motivator_type, 'weight': min(weight, 1.0)})
-        
-        # Default interests based on content
         interests = []
-        interest_keywords = {
-            'technology': ['tech', 'software', 'digital', 'computer', 'programming', 'coding', 'ai', 'machine learning'],
-            'business': ['business', 'startup', 'company', 'enterprise', 'commerce', 'trade'],
-            'social_impact': ['social', 'community', 'ngo', 'help', 'volunteer', 'charity', 'non-profit'],
-            'arts': ['art', 'creative', 'design', 'painting', 'music', 'dance', 'theater', 'writing'],
-            'science': ['science', 'research', 'experiment', 'discover', 'analyze', 'data'],
-            'education': ['teach', 'learn', 'education', 'school', 'university', 'knowledge'],
-            'healthcare': ['health', 'medical', 'doctor', 'nurse', 'hospital', 'wellness'],
-            'sports': ['sports', 'fitness', 'athlete', 'game', 'competition', 'exercise'],
-            'environment': ['environment', 'sustainability', 'climate', 'nature', 'eco-friendly'],
-            'entertainment': ['entertainment', 'media', 'film', 'tv', 'gaming', 'music']
-        }
-        
-        for interest_area, keywords in interest_keywords.items():
-            weight = sum(1 for keyword in keywords if keyword in option_lower) * 0.2
+        for category, key, keywords, increment in _TARGET_KEYWORDS:
+            weight = sum(1 for keyword in keywords if keyword in option_lower) * increment
             if weight > 0:
-                interests.append({'area': interest_area, 'weight': min(weight, 1.0)})
-        
+                if category == "motivators":
+                    motivators.append({'type': key, 'weight': min(weight, 1.0)})
+                else:
+                    interests.append({'area': key, 'weight': min(weight, 1.0)})
+
         return {
             'motivators': motivators[:3],  # Top 3 motivators
             'interests': interests[:2],   # Top 2 interests
@@ -1,4 +1,11 @@
-import json
+import asyncio
+import heapq
+import logging
+import os
+import time
+from operator import attrgetter
+
+import orjson
 from typing import List, Dict, Any
 from openai import AsyncOpenAI
 from compass_schemas import (
@@ -9,10 +16,89 @@ from compass_schemas import (
     GeneratedQuestion
 )
 
+logger = logging.getLogger(__name__)
+
+class _CircuitBreaker:
+    """Consecutive-failure breaker for the analysis completion calls.
+
+    Closed until `threshold` consecutive failures, then open for `cooldown`
+    seconds, during which calls are refused outright; the first call after
+    the cooldown goes through as a half-open probe and a success closes the
+    breaker again. Keeps a provider outage from stacking up doomed
+    retry-laden requests behind the semaphore.
+    """
+    def __init__(self, threshold: int = None, cooldown: float = None):
+        self.threshold = threshold or int(os.getenv("ANALYSIS_BREAKER_THRESHOLD", "5"))
+        self.cooldown = cooldown or float(os.getenv("ANALYSIS_BREAKER_COOLDOWN", "30"))
+        self._failures = 0
+        self._opened_at = 0.0
+
+    def allow(self) -> bool:
+        if self._failures < self.threshold:
+            return True
+        # Open: refuse until the cooldown elapses, then allow one probe
+        return time.monotonic() - self._opened_at >= self.cooldown
+
+    def record_success(self):
+        self._failures = 0
+
+    def record_failure(self):
+        self._failures += 1
+        if self._failures >= self.threshold:
+            self._opened_at = time.monotonic()
+
+# Static extraction instructions and output schema stay in the system message
+# so provider-side prompt caching hits on every analysis call; only the
+# question/response pair varies per call.
+ANALYSIS_SYSTEM_PROMPT = """You are an expert career psychologist analyzing responses for career alignment indicators.
+
+For each response, extract signals for:
+
+1. Career Motivators (identify any clearly present from this list):
+   {motivator_types}
+
+   - For each motivator found, provide: type, strength (1-10), and a brief evidence quote.
+
+2. Interests: Specific activities, subjects, skills, or domains mentioned or implied
+   - For each interest, provide: category, specific (short phrase), and enthusiasm (1-10).
+
+For MCQ selections, base the analysis on the option the user selected from the
+scenario; for free-text responses, analyze explicit statements and implicit
+indicators (values, emotions, examples, work style).
+
+Output as JSON:
+{{
+  "motivators": [
+    {{"type": "motivator name", "strength": 1-10, "evidence": "short quote"}}
+  ],
+  "interests": [
+    {{"category": "technology/arts/business/science/etc", "specific": "detailed interest", "enthusiasm": 1-10}}
+  ],
+  "metadata": {{
+    "response_quality": "high/medium/low",
+    "contradictions": ["any conflicting signals"],
+    "strong_signals": ["notably clear indicators (motivators or interests)"]
+  }}
+}}
+
+Only include items with clear supporting evidence."""
+
 class ResponseAnalyzerService:
+    # Valid MCQ letters -> option index; one dict probe replaces the
+    # strip/upper/ord arithmetic repeated across the MCQ paths
+    _MCQ_IDX = {'A': 0, 'B': 1, 'C': 2, 'D': 3}
+
+    # Free-text answers that carry no analyzable signal; not worth an LLM
+    # round-trip or a cache entry
+    _NO_SIGNAL = frozenset({"idk", "n/a", "na", "none", "-", "?", "ok", "no", "yes"})
+
     def __init__(self, openai_client: AsyncOpenAI):
         self.client = openai_client
-        self.model = "gpt-4-turbo-preview"
+        # Structured extraction with a fixed rubric is well within the mini
+        # tier at a fraction of the cost and latency; the turbo model stays
+        # as a fallback for responses the mini model fails to parse
+        self.model = os.getenv("ANALYSIS_MODEL", "gpt-4o-mini")
+        self.fallback_model = "gpt-4-turbo-preview"
         
         self.motivator_types = [
             "Money & Compensation",
@@ -28,6 +114,10 @@ class ResponseAnalyzerService:
             "Challenge & Competition",
             "Leadership & Influence"
         ]
+        self.system_prompt = ANALYSIS_SYSTEM_PROMPT.format(
+            motivator_types=', '.join(self.motivator_types)
+        )
+        self._breaker = _CircuitBreaker()
     
     async def analyze_response(
         self,
@@ -39,99 +129,73 @@ class ResponseAnalyzerService:
             return self._create_skipped_analysis()
         
         # Check if this is an MCQ response with metadata
-        is_mcq = response.response_text.strip().upper() in ['A', 'B', 'C', 'D']
+        option_index = self._MCQ_IDX.get(
+            response.response_text.strip().upper() if response.response_text else ''
+        )
         
-        if is_mcq and question.options:
+        if option_index is not None and question.options:
             # Use the pre-calculated metadata from the selected option
-            return self._analyze_mcq_with_metadata(response, question)
-        else:
-            # Fall back to GPT-4 analysis for free-text responses
-            return await self._analyze_with_gpt4(response, question)
-    
-    def _build_analysis_prompt(self, response_text: str, question_text: str) -> str:
-        # Check if this is an MCQ response (single letter A, B, C, or D)
-        is_mcq = response_text.strip().upper() in ['A', 'B', 'C', 'D']
-        
-        if is_mcq:
-            prompt = f"""Analyze this MCQ selection for career alignment indicators:
-
-Question and Options: "{question_text}"
-User Selected: Option {response_text.strip().upper()}
-
-Based on the option they selected from the scenario, extract signals for:
-
-1. Career Motivators (identify any clearly present from this list):
-   {', '.join(self.motivator_types)}
-
-   - For each motivator found, provide: type, strength (1-10), and a brief evidence quote.
-
-2. Interests: Specific activities, subjects, skills, or domains implied by the option
-   - For each interest, provide: category, specific (short phrase), and enthusiasm (1-10).
+            return self._analyze_mcq_with_metadata(option_index, question)
 
-Consider both explicit context and implicit indicators from the selected option.
-
-Output as JSON:
-{{
-  "motivators": [
-    {{"type": "motivator name", "strength": 1-10, "evidence": "short quote"}}
-  ],
-  "interests": [
-    {{"category": "technology/arts/business/science/etc", "specific": "detailed interest", "enthusiasm": 1-10}}
-  ],
-  "metadata": {{
-    "response_quality": "high/medium/low",
-    "contradictions": ["any conflicting signals"],
-    "strong_signals": ["notably clear indicators (motivators or interests)"]
-  }}
-}}
-
-Only include items with clear supporting evidence."""
-        else:
-            prompt = f"""Analyze this response for career alignment indicators:
-
-Question Asked: "{question_text}"
-User Response: "{response_text}"
+        # Free text: discard no-signal answers locally before spending an
+        # LLM call on them (after MCQ dispatch - single letters are valid
+        # selections, not noise)
+        text = (response.response_text or "").strip()
+        if len(text) < 3 or text.lower() in self._NO_SIGNAL:
+            return self._create_skipped_analysis()
 
-Extract signals for:
+        # Fall back to GPT-4 analysis for free-text responses
+        return await self._analyze_with_gpt4(response, question)
 
-1. Career Motivators (identify any clearly present from this list):
-   {', '.join(self.motivator_types)}
+    async def analyze_responses(
+        self,
+        pairs: List[tuple],
+        max_concurrency: int = 32
+    ) -> List[ResponseAnalysis]:
+        """Analyze many (response, question) pairs concurrently.
 
-   - For each motivator found, provide: type, strength (1-10), and a brief evidence quote.
+        Each free-text analysis blocks on a chat-completion RTT, so running
+        them together scales near-linearly; the semaphore bounds the fan-out
+        to the API tier's budget, and MCQ pairs resolve instantly inside the
+        same gather. Results come back in input order.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
 
-2. Interests: Specific activities, subjects, skills, or domains mentioned
-   - For each interest, provide: category, specific (short phrase), and enthusiasm (1-10).
+        async def _one(response: UserResponse, question: GeneratedQuestion) -> ResponseAnalysis:
+            async with semaphore:
+                return await self.analyze_response(response, question)
 
-Analyze explicit statements and implicit indicators (values, emotions, examples, work style).
+        return await asyncio.gather(*(_one(r, q) for r, q in pairs))
 
-Output as JSON:
-{{
-  "motivators": [
-    {{"type": "motivator name", "strength": 1-10, "evidence": "short quote"}}
-  ],
-  "interests": [
-    {{"category": "technology/arts/business/science/etc", "specific": "detailed interest", "enthusiasm": 1-10}}
-  ],
-  "metadata": {{
-    "response_quality": "high/medium/low",
-    "contradictions": ["any conflicting signals"],
-    "strong_signals": ["notably clear indicators (motivators or interests)"]
-  }}
-}}
+    def _build_analysis_prompt(self, response_text: str, question_text: str) -> str:
+        # Only the per-call variables; the instructions and schema live in the
+        # cached system prompt. MCQ responses never reach here - they resolve
+        # from option metadata in _analyze_mcq_with_metadata.
+        return (
+            f'Question Asked: "{question_text}"\n'
+            f'User Response: "{response_text}"'
+        )
 
-Only include items with clear supporting evidence."""
-        
-        return prompt
-    
     def _process_analysis_result(self, result: Dict[str, Any]) -> ResponseAnalysis:
-        # Process motivators
+        # Process motivators, deriving confidence inline from strength and
+        # evidence quality: one read per field instead of a second dict walk
+        # in a helper frame. Full pydantic validation stays - this is LLM
+        # output.
         motivators = []
         for motivator_data in result.get("motivators", []):
+            strength = motivator_data["strength"]
+            evidence = motivator_data["evidence"]
+            confidence = 40.0
+            if evidence and evidence.strip():
+                for floor, banded in self._CONFIDENCE_BANDS:
+                    if strength >= floor:
+                        confidence = banded
+                        break
             motivators.append(CareerMotivator(
                 type=motivator_data["type"],
-                strength=motivator_data["strength"],
-                evidence=motivator_data["evidence"],
-                confidence=self._calculate_motivator_confidence(motivator_data)
+                strength=strength,
+                evidence=evidence,
+                confidence=confidence
             ))
         
         # Process interests  
@@ -154,19 +218,9 @@ Only include items with clear supporting evidence."""
             strong_signals=metadata.get("strong_signals", [])
         )
     
-    def _calculate_motivator_confidence(self, motivator_data: Dict) -> float:
-        # Calculate confidence based on strength and evidence quality
-        strength = motivator_data.get("strength", 5)
-        has_evidence = bool(motivator_data.get("evidence", "").strip())
-        
-        if strength >= 8 and has_evidence:
-            return 90.0
-        elif strength >= 6 and has_evidence:
-            return 75.0
-        elif strength >= 4 and has_evidence:
-            return 60.0
-        else:
-            return 40.0
+    # (strength floor, confidence) bands for evidence-backed motivators,
+    # scanned top-down in _process_analysis_result
+    _CONFIDENCE_BANDS = ((8, 90.0), (6, 75.0), (4, 60.0))
     
     def _create_skipped_analysis(self) -> ResponseAnalysis:
         return ResponseAnalysis(
@@ -177,14 +231,10 @@ Only include items with clear supporting evidence."""
             strong_signals=[]
         )
     
-    def _analyze_mcq_with_metadata(self, response: UserResponse, question: GeneratedQuestion) -> ResponseAnalysis:
+    def _analyze_mcq_with_metadata(self, option_index: int, question: GeneratedQuestion) -> ResponseAnalysis:
         """Extract analysis directly from option metadata"""
-        # Find the selected option
-        option_letter = response.response_text.strip().upper()
-        option_index = ord(option_letter) - ord('A')
-        
-        if option_index < 0 or option_index >= len(question.options):
-            # Invalid option selected
+        if option_index >= len(question.options):
+            # Letter beyond the options actually offered
             return self._create_skipped_analysis()
         
         selected_option = question.options[option_index]
@@ -196,6 +246,10 @@ Only include items with clear supporting evidence."""
                 # Handle dict format: {type: "autonomy", weight: 0.7}
                 motivator_type = motivator_dict.get('type', 'Unknown')
                 motivator_weight = motivator_dict.get('weight', 0.5)
+                # Validating constructor: option weights are raw LLM output
+                # (List[Dict] on OptionTarget, never range-checked), so an
+                # out-of-bounds weight must fail here rather than persist an
+                # invalid analysis the next state load can't parse
                 motivators.append(CareerMotivator(
                     type=motivator_type,
                     strength=motivator_weight * 10,  # Convert 0-1 to 0-10 scale
@@ -216,15 +270,17 @@ Only include items with clear supporting evidence."""
                     enthusiasm=interest_weight * 10  # Convert 0-1 to 0-10 scale
                 ))
         
-        # Determine strong signals based on highest motivator strength and interest enthusiasm
+        # Determine strong signals based on highest motivator strength and
+        # interest enthusiasm; nlargest takes the top two without sorting or
+        # materializing the rest, with the comparator in C
         strong_signals = []
         if motivators:
-            top_motivators = sorted(motivators, key=lambda m: m.strength, reverse=True)[:2]
+            top_motivators = heapq.nlargest(2, motivators, key=attrgetter('strength'))
             for m in top_motivators:
                 if m.strength >= 7:
                     strong_signals.append(m.type)
         if interests and len(strong_signals) < 2:
-            top_interests = sorted(interests, key=lambda i: (i.enthusiasm or 0), reverse=True)[:2]
+            top_interests = heapq.nlargest(2, interests, key=lambda i: (i.enthusiasm or 0))
             for i in top_interests:
                 if (i.enthusiasm or 0) >= 7:
                     strong_signals.append(i.category or (i.specific or "interest"))
@@ -238,22 +294,58 @@ Only include items with clear supporting evidence."""
         )
     
     async def _analyze_with_gpt4(self, response: UserResponse, question: GeneratedQuestion) -> ResponseAnalysis:
-        """Fallback to GPT-4 analysis for free-text responses"""
+        """Fallback to GPT analysis for free-text responses"""
         # Build the analysis prompt
         prompt = self._build_analysis_prompt(response.response_text, question.question_text)
         
-        # Get GPT-4 analysis
+        if not self._breaker.allow():
+            # Provider is down; degrade to an empty analysis (same shape as a
+            # skip) instead of queueing another doomed call
+            logger.warning("Analysis circuit open - recording response without signals")
+            return self._create_skipped_analysis()
+
+        try:
+            analysis = await self._request_analysis(self.model, prompt)
+        except (ValueError, KeyError) as e:
+            # Mini-tier output that fails to parse gets one retry on the
+            # larger model rather than surfacing to the journey
+            logger.warning(f"Analysis via {self.model} unparseable ({e}); retrying with {self.fallback_model}")
+            try:
+                analysis = await self._request_analysis(self.fallback_model, prompt)
+            except Exception:
+                self._breaker.record_failure()
+                raise
+        except Exception:
+            # Transport/provider failure (the SDK has already exhausted its
+            # own backoff retries by the time it raises)
+            self._breaker.record_failure()
+            raise
+        self._breaker.record_success()
+        return analysis
+
+    async def _request_analysis(self, model: str, prompt: str) -> ResponseAnalysis:
         completion = await self.client.chat.completions.create(
-            model=self.model,
+            model=model,
             messages=[
-                {"role": "system", "content": "You are an expert career psychologist analyzing responses for career alignment indicators."},
+                {"role": "system", "content": self.system_prompt},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.3,  # Lower temperature for more consistent analysis
             response_format={"type": "json_object"}
         )
         
-        result = json.loads(completion.choices[0].message.content)
+        # Surface the provider's prefix-cache hit rate: with the rubric in
+        # the system prompt the cached share should approach the full prefix
+        if logger.isEnabledFor(logging.DEBUG):
+            details = getattr(completion.usage, "prompt_tokens_details", None)
+            if details is not None:
+                logger.debug(
+                    "Analysis prompt tokens: %s (%s cached)",
+                    completion.usage.prompt_tokens,
+                    getattr(details, "cached_tokens", 0)
+                )
+
+        result = orjson.loads(completion.choices[0].message.content)
         
         # Process and structure the analysis
         return self._process_analysis_result(result)
\ No newline at end of file
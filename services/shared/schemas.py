@@ -1,8 +1,14 @@
 """Shared schemas used across all microservices"""
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 from typing import Dict, List, Optional, Any
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
+from functools import partial
+
+# Stamped on every request/response/event: datetime.now(tz) is cheaper than
+# utcnow() and yields an aware datetime, so consumers can't misread the
+# timestamp in local time
+_utc_now = partial(datetime.now, timezone.utc)
 
 # User related shared schemas
 class UserContext(BaseModel):
@@ -17,25 +23,37 @@ class UserContext(BaseModel):
 # Service communication schemas
 class ServiceRequest(BaseModel):
     """Standard request format for inter-service communication"""
+    # Wire-format payloads: immutable once built, and unknown fields from
+    # newer publishers are dropped rather than rejected
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     request_id: str
     user_id: str
     service_name: str
     action: str
     data: Dict[str, Any]
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = Field(default_factory=_utc_now)
 
 class ServiceResponse(BaseModel):
     """Standard response format for inter-service communication"""
+    # Wire-format payloads: immutable once built, and unknown fields from
+    # newer publishers are dropped rather than rejected
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     request_id: str
     service_name: str
     status: str  # success, error, partial
     data: Optional[Dict[str, Any]] = None
     error: Optional[str] = None
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = Field(default_factory=_utc_now)
 
 # Profile components that can be aggregated
 class ProfileComponent(BaseModel):
     """Base class for any profile component from any service"""
+    # Wire-format payloads: immutable once built, and unknown fields from
+    # newer publishers are dropped rather than rejected
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     component_type: str
     service_origin: str
     confidence: float = Field(ge=0, le=100)
@@ -43,6 +61,10 @@ class ProfileComponent(BaseModel):
     generated_at: datetime
     version: str = "1.0"
 
+# Bulk validator for component lists: one TypeAdapter call validates the
+# whole batch in Rust-side loops instead of per-item Model(**d) dispatch
+PROFILE_COMPONENT_LIST_ADAPTER = TypeAdapter(List[ProfileComponent])
+
 # Aggregated user profile
 class AggregatedProfile(BaseModel):
     """Complete user profile aggregating all services' outputs"""
@@ -54,12 +76,16 @@ class AggregatedProfile(BaseModel):
 # Event schemas for async communication
 class ServiceEvent(BaseModel):
     """Event structure for message broker communication"""
+    # Wire-format payloads: immutable once built, and unknown fields from
+    # newer publishers are dropped rather than rejected
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     event_id: str
     event_type: str
     service_origin: str
     user_id: Optional[str] = None
     data: Dict[str, Any]
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = Field(default_factory=_utc_now)
 
 # Module status tracking
 class ModuleStatus(str, Enum):
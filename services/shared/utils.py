@@ -1,8 +1,11 @@
 """Shared utilities for all microservices"""
+import asyncio
 import os
-import json
 import logging
-from typing import Optional, Dict, Any
+import time
+from typing import Optional, Dict, Any, List
+import msgpack
+import orjson
 import redis.asyncio as redis
 from openai import AsyncOpenAI
 import httpx
@@ -14,10 +17,16 @@ logger = logging.getLogger(__name__)
 
 class ServiceRegistry:
     """Service discovery and registry"""
-    def __init__(self, redis_client: redis.Redis):
-        self.redis = redis_client
+    def __init__(self, cache_ttl: float = 5.0):
+        # Registry entries are msgpack (binary), so the registry reads and
+        # writes through the shared non-decoding client
+        self.redis = get_raw_redis_client()
         self.services_key = "services:registry"
-        
+        self.cache_ttl = cache_ttl
+        # In-process cache: {service_name: (service_info, expires_at)}
+        # avoids one Redis RTT per incoming request
+        self._cache: Dict[str, tuple] = {}
+
     async def register_service(self, service_name: str, host: str, port: int, health_endpoint: str = "/health"):
         """Register a service in the registry"""
         service_info = {
@@ -28,15 +37,59 @@ class ServiceRegistry:
             "registered_at": datetime.utcnow().isoformat(),
             "status": "active"
         }
-        await self.redis.hset(self.services_key, service_name, json.dumps(service_info))
+        await self.redis.hset(
+            self.services_key, service_name,
+            msgpack.packb(service_info, use_bin_type=True)
+        )
+        self._cache.pop(service_name, None)
         logger.info(f"Service {service_name} registered at {host}:{port}")
-        
+
+    @staticmethod
+    def _unpack(value: bytes) -> Dict[str, Any]:
+        try:
+            return msgpack.unpackb(value, raw=False)
+        except Exception:
+            # Entries written by registrars still on JSON during rollout
+            return orjson.loads(value)
+
     async def get_service(self, service_name: str) -> Optional[Dict[str, Any]]:
         """Get service information from registry"""
+        cached = self._cache.get(service_name)
+        if cached and time.monotonic() < cached[1]:
+            return cached[0]
+
         service_data = await self.redis.hget(self.services_key, service_name)
         if service_data:
-            return json.loads(service_data)
+            service_info = self._unpack(service_data)
+            self._cache[service_name] = (service_info, time.monotonic() + self.cache_ttl)
+            return service_info
         return None
+
+    async def get_services(self, service_names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get multiple services at once.
+
+        Cache misses are coalesced into one HMGET so enumerating N services
+        costs a single Redis round-trip (zero on TTL-cache hits).
+        """
+        services = {}
+        missing = []
+        for name in service_names:
+            cached = self._cache.get(name)
+            if cached and time.monotonic() < cached[1]:
+                services[name] = cached[0]
+            else:
+                missing.append(name)
+
+        if missing:
+            values = await self.redis.hmget(self.services_key, missing)
+            expires_at = time.monotonic() + self.cache_ttl
+            for name, value in zip(missing, values):
+                if value:
+                    service_info = self._unpack(value)
+                    services[name] = service_info
+                    self._cache[name] = (service_info, expires_at)
+
+        return services
     
     async def get_service_url(self, service_name: str) -> Optional[str]:
         """Get the URL for a service"""
@@ -45,17 +98,51 @@ class ServiceRegistry:
             return f"http://{service['host']}:{service['port']}"
         return None
     
+    def invalidate(self, service_name: str):
+        """Drop a service from the in-process cache.
+
+        Callers that hit connection errors or 5xx responses use this so the
+        next lookup re-reads the registry instead of riding out the TTL on a
+        stale address.
+        """
+        self._cache.pop(service_name, None)
+
     async def deregister_service(self, service_name: str):
         """Remove a service from registry"""
         await self.redis.hdel(self.services_key, service_name)
+        self._cache.pop(service_name, None)
         logger.info(f"Service {service_name} deregistered")
 
+# Process-wide HTTP client shared by every InterServiceClient instance:
+# one warm HTTP/2 pool per peer instead of one pool per consumer
+_http_client: Optional[httpx.AsyncClient] = None
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared inter-service HTTP client, creating it on first use.
+
+    HTTP/2 multiplexes concurrent calls over one connection per peer, the
+    tight connect timeout fails fast on a down service, and keepalive_expiry
+    keeps idle connections warm across request lulls.
+    """
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            http2=True,
+            timeout=httpx.Timeout(30.0, connect=2.0),
+            limits=httpx.Limits(
+                max_connections=200,
+                max_keepalive_connections=100,
+                keepalive_expiry=60
+            )
+        )
+    return _http_client
+
 class InterServiceClient:
     """Client for inter-service communication"""
     def __init__(self, service_registry: ServiceRegistry):
         self.registry = service_registry
-        self.client = httpx.AsyncClient(timeout=30.0)
-        
+        self.client = get_http_client()
+
     async def call_service(
         self,
         service_name: str,
@@ -86,45 +173,167 @@ class InterServiceClient:
             response.raise_for_status()
             return response.json()
         except httpx.HTTPError as e:
+            # Only connection failures and 5xx suggest a stale cached
+            # address; a 4xx is the service answering normally, so keep the
+            # lookup cache warm for it
+            if isinstance(e, httpx.TransportError) or (
+                isinstance(e, httpx.HTTPStatusError)
+                and e.response.status_code >= 500
+            ):
+                self.registry.invalidate(service_name)
             logger.error(f"Error calling service {service_name}: {e}")
             raise
     
     async def close(self):
-        """Close the HTTP client"""
-        await self.client.aclose()
+        """Close the shared HTTP client (call once at process shutdown)"""
+        global _http_client
+        if _http_client is not None:
+            await _http_client.aclose()
+            _http_client = None
+
+# Streams are capped so an idle consumer group can't grow a channel without
+# bound; ~100k entries is hours of backlog at expected event rates
+_STREAM_MAXLEN = 100000
 
 class EventPublisher:
-    """Publish events to message broker (Redis Pub/Sub)"""
-    def __init__(self, redis_client: redis.Redis):
+    """Publish events to message broker (Redis Streams)"""
+    def __init__(self, redis_client: redis.Redis, batch_size: int = 64, flush_interval: float = 0.005):
         self.redis = redis_client
-        
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: Optional[asyncio.Queue] = None
+        self._drain_task: Optional[asyncio.Task] = None
+
     async def publish(self, channel: str, event: Dict[str, Any]):
-        """Publish an event to a channel"""
-        event_data = json.dumps(event)
-        await self.redis.publish(channel, event_data)
+        """Queue an event for publishing; a background task batches XADDs"""
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+            self._drain_task = asyncio.get_running_loop().create_task(self._drain())
+        await self._queue.put((channel, msgpack.packb(event, use_bin_type=True, default=str)))
         logger.info(f"Published event to {channel}: {event.get('event_type', 'unknown')}")
 
+    async def _drain(self):
+        """Coalesce queued events and flush them in a single pipeline"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                async with self.redis.pipeline(transaction=False) as pipe:
+                    for channel, event_data in batch:
+                        pipe.xadd(
+                            channel,
+                            {"data": event_data},
+                            maxlen=_STREAM_MAXLEN,
+                            approximate=True
+                        )
+                    await pipe.execute()
+            except Exception as e:
+                logger.error(f"Failed to publish event batch: {e}")
+
+    async def close(self):
+        """Flush any queued events and stop the drain task"""
+        if self._drain_task:
+            while self._queue and not self._queue.empty():
+                await asyncio.sleep(self.flush_interval)
+            self._drain_task.cancel()
+            self._drain_task = None
+
 class EventSubscriber:
-    """Subscribe to events from message broker"""
-    def __init__(self, redis_client: redis.Redis):
-        self.redis = redis_client
-        self.pubsub = self.redis.pubsub()
-        
+    """Consume events from message broker (Redis Streams consumer groups).
+
+    Streams give at-least-once delivery: events published while a consumer is
+    slow or restarting wait in the stream instead of being dropped, and
+    replicas joining the same group share the load. Entries are acknowledged
+    only after the consumer has processed the batch they arrived in.
+    """
+    def __init__(
+        self,
+        batch_size: int = 64,
+        poll_timeout: float = 0.05,
+        group: str = "default",
+        consumer: Optional[str] = None
+    ):
+        # Event payloads are msgpack (binary), so the consumer reads through
+        # the shared non-decoding client
+        self.redis = get_raw_redis_client()
+        self.batch_size = batch_size
+        self.poll_timeout = poll_timeout
+        self.group = group
+        self.consumer = consumer or f"consumer-{os.getpid()}"
+        self.channels: List[str] = []
+
     async def subscribe(self, channels: list):
-        """Subscribe to channels"""
-        await self.pubsub.subscribe(*channels)
-        logger.info(f"Subscribed to channels: {channels}")
-        
+        """Create the consumer group on each channel's stream"""
+        for channel in channels:
+            try:
+                # id="$": a brand-new group starts at the tip; after that the
+                # group's position persists in Redis across restarts
+                await self.redis.xgroup_create(channel, self.group, id="$", mkstream=True)
+            except redis.ResponseError as e:
+                if "BUSYGROUP" not in str(e):
+                    raise
+        self.channels = list(channels)
+        logger.info(f"Consumer group '{self.group}' reading channels: {channels}")
+
+    @staticmethod
+    def _decode(data: bytes) -> Dict[str, Any]:
+        try:
+            return msgpack.unpackb(data, raw=False)
+        except Exception:
+            # Publishers still on JSON during rollout
+            return orjson.loads(data)
+
+    async def listen_batches(self):
+        """Yield lists of events, up to batch_size per XREADGROUP round-trip.
+
+        The previous batch is XACKed (pipelined) when the generator resumes,
+        i.e. after the consumer finished processing it -- so a crash mid-batch
+        leaves those entries pending for redelivery rather than lost.
+        """
+        streams = {channel: ">" for channel in self.channels}
+        block_ms = int(self.poll_timeout * 1000)
+        pending_acks: List[tuple] = []
+        while True:
+            if pending_acks:
+                async with self.redis.pipeline(transaction=False) as pipe:
+                    for stream_name, entry_id in pending_acks:
+                        pipe.xack(stream_name, self.group, entry_id)
+                    await pipe.execute()
+                pending_acks = []
+            entries = await self.redis.xreadgroup(
+                self.group, self.consumer, streams,
+                count=self.batch_size, block=block_ms
+            )
+            if not entries:
+                continue
+            batch = []
+            for stream_name, messages in entries:
+                for entry_id, fields in messages:
+                    data = fields.get(b"data")
+                    if data is not None:
+                        batch.append(self._decode(data))
+                    pending_acks.append((stream_name, entry_id))
+            if batch:
+                yield batch
+
     async def listen(self):
-        """Listen for messages"""
-        async for message in self.pubsub.listen():
-            if message['type'] == 'message':
-                data = json.loads(message['data'])
-                yield data
-    
+        """Listen for messages one at a time"""
+        async for batch in self.listen_batches():
+            for event in batch:
+                yield event
+
     async def unsubscribe(self):
-        """Unsubscribe from all channels"""
-        await self.pubsub.unsubscribe()
+        """Stop reading; the group and its position stay in Redis"""
+        self.channels = []
 
 class CacheManager:
     """Centralized cache management"""
@@ -136,14 +345,39 @@ class CacheManager:
         """Get value from cache"""
         value = await self.redis.get(key)
         if value:
-            return json.loads(value)
+            return orjson.loads(value)
         return None
     
     async def set(self, key: str, value: Any, ttl: Optional[int] = None):
         """Set value in cache"""
         ttl = ttl or self.default_ttl
-        await self.redis.setex(key, ttl, json.dumps(value))
+        await self.redis.setex(key, ttl, orjson.dumps(value))
+
+    async def mset(self, items: Dict[str, Any], ttl: Optional[int] = None):
+        """Set many values in one pipelined round-trip.
+
+        Burst writers (e.g. event handlers draining a busy channel) should
+        buffer and flush through here: N SETEX commands cost one RTT.
+        """
+        ttl = ttl or self.default_ttl
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for key, value in items.items():
+                pipe.setex(key, ttl, orjson.dumps(value))
+            await pipe.execute()
     
+    async def get_raw(self, key: str) -> Optional[Any]:
+        """Get a value without deserializing (e.g. to stream bytes through)"""
+        return await self.redis.get(key)
+
+    async def set_raw(self, key: str, value, ttl: Optional[int] = None):
+        """Set an already-serialized value, skipping the orjson pass.
+
+        For callers holding model_dump_json() output or other pre-encoded
+        bytes/str, encoding again here would be a second full serialization
+        of the same data.
+        """
+        await self.redis.setex(key, ttl or self.default_ttl, value)
+
     async def delete(self, key: str):
         """Delete from cache"""
         await self.redis.delete(key)
@@ -153,13 +387,60 @@ class CacheManager:
         return await self.redis.exists(key) > 0
 
 def get_openai_client() -> AsyncOpenAI:
-    """Get OpenAI client instance"""
+    """Get OpenAI client instance backed by a tuned HTTP transport.
+
+    Call once per process at startup (the services do this in lifespan) and
+    share the instance; a fresh client per request would pay TCP+TLS setup on
+    every call. The SDK's default httpx client caps keepalive connections
+    well below what concurrent journeys need; a widened HTTP/2 pool keeps
+    chat-completion calls from queueing on connection setup under load, with
+    a tight connect timeout so pool acquisition fails fast. max_retries raises the SDK's
+    built-in exponential backoff (which honors Retry-After on 429/5xx) above
+    the default of 2, so fan-out bursts ride out throttling instead of
+    surfacing RateLimitError to the journey.
+    """
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         raise ValueError("OPENAI_API_KEY not set")
-    return AsyncOpenAI(api_key=api_key)
+    http_client = httpx.AsyncClient(
+        http2=True,
+        timeout=httpx.Timeout(30.0, connect=5.0),
+        limits=httpx.Limits(max_connections=200, max_keepalive_connections=100)
+    )
+    return AsyncOpenAI(
+        api_key=api_key,
+        http_client=http_client,
+        max_retries=int(os.getenv("OPENAI_MAX_RETRIES", "5"))
+    )
 
-def get_redis_client(url: Optional[str] = None) -> redis.Redis:
-    """Get Redis client instance"""
+def get_redis_client(url: Optional[str] = None, decode_responses: bool = True) -> redis.Redis:
+    """Get Redis client instance backed by a bounded connection pool.
+
+    Pass decode_responses=False for callers that store binary values
+    (e.g. compressed payloads).
+    """
     redis_url = url or os.getenv("REDIS_URL", "redis://localhost:6379")
-    return redis.from_url(redis_url, decode_responses=True)
\ No newline at end of file
+    pool = redis.ConnectionPool.from_url(
+        redis_url,
+        max_connections=int(os.getenv("REDIS_POOL_SIZE", os.getenv("REDIS_MAX_CONNECTIONS", "64"))),
+        # Every operation here is a small key; anything slower than this is
+        # an outage, so fail fast rather than holding the pool slot
+        socket_timeout=2,
+        socket_connect_timeout=1,
+        socket_keepalive=True,
+        health_check_interval=30,
+        decode_responses=decode_responses
+    )
+    return redis.Redis(connection_pool=pool)
+
+# Process-wide non-decoding client shared by the binary-payload consumers
+# (registry entries, msgpack events): one bounded pool instead of one per
+# instance
+_raw_redis_client: Optional[redis.Redis] = None
+
+def get_raw_redis_client() -> redis.Redis:
+    """Get the shared decode_responses=False client, creating it on first use"""
+    global _raw_redis_client
+    if _raw_redis_client is None:
+        _raw_redis_client = get_redis_client(decode_responses=False)
+    return _raw_redis_client
\ No newline at end of file
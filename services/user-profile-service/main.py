@@ -1,5 +1,6 @@
 """User Profile Service - Aggregates profiles from all modules"""
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Response
+from fastapi.responses import StreamingResponse
 from contextlib import asynccontextmanager
 import os
 import sys
@@ -7,16 +8,17 @@ from pathlib import Path
 from dotenv import load_dotenv
 from typing import Dict, List, Any
 from datetime import datetime
-import json
+import orjson
 import asyncio
+import time
 
 # Add parent directory to path for shared imports
 sys.path.append(str(Path(__file__).parent.parent))
 from shared.utils import (
-    ServiceRegistry, 
-    EventSubscriber, 
+    ServiceRegistry,
+    EventSubscriber,
     EventPublisher,
-    CacheManager,
+    InterServiceClient,
     get_redis_client
 )
 from shared.schemas import (
@@ -31,25 +33,109 @@ load_dotenv()
 # Global instances
 app_state = {}
 
-# In-memory storage (replace with database in production)
+# Profiles live in Redis hashes (profile:{user_id}) so replicas share state
+# and restarts keep it; this dict is only a bounded in-process cache of hot
+# users on top of that store
 user_profiles: Dict[str, AggregatedProfile] = {}
-module_progress: Dict[str, Dict[str, ModuleProgress]] = {}
+_PROFILE_CACHE_MAX = 1024
+
+# Known modules, built once at import instead of per request
+ALL_MODULES = ("compass", "skill-analyzer", "expertise-analyzer")
+
+# User ids whose Redis hash is behind the in-process copy; a background task
+# batches these into one pipelined write instead of one HSET per event
+dirty_profiles: set = set()
+
+def _cache_profile(user_id: str, profile: AggregatedProfile):
+    """Insert into the hot-user cache, evicting clean entries when full"""
+    if len(user_profiles) >= _PROFILE_CACHE_MAX and user_id not in user_profiles:
+        for uid in list(user_profiles):
+            if uid not in dirty_profiles:
+                del user_profiles[uid]
+    user_profiles[user_id] = profile
+
+def _profile_mapping(profile: AggregatedProfile) -> Dict[str, Any]:
+    """Flatten a profile into its Redis hash fields"""
+    mapping: Dict[str, Any] = {
+        f"component:{ctype}": orjson.dumps(component.dict())
+        for ctype, component in profile.components.items()
+    }
+    for service, status in profile.completion_status.items():
+        mapping[f"completion:{service}"] = status
+    mapping["last_updated"] = profile.last_updated.isoformat()
+    return mapping
+
+def _profile_from_hash(user_id: str, data: Dict[str, str]) -> AggregatedProfile:
+    """Rebuild a profile from its Redis hash fields"""
+    components = {}
+    completion_status = {}
+    last_updated = datetime.utcnow()
+    for field, value in data.items():
+        if field.startswith("component:"):
+            components[field[len("component:"):]] = ProfileComponent(**orjson.loads(value))
+        elif field.startswith("completion:"):
+            completion_status[field[len("completion:"):]] = value
+        elif field == "last_updated":
+            last_updated = datetime.fromisoformat(value)
+    return AggregatedProfile(
+        user_id=user_id,
+        components=components,
+        last_updated=last_updated,
+        completion_status=completion_status
+    )
+
+async def _get_profile(user_id: str) -> Any:
+    """Get a profile from the hot-user cache, falling back to Redis"""
+    profile = user_profiles.get(user_id)
+    if profile is not None:
+        return profile
+    data = await app_state["redis"].hgetall(f"profile:{user_id}")
+    if not data:
+        return None
+    profile = _profile_from_hash(user_id, data)
+    _cache_profile(user_id, profile)
+    return profile
+
+async def profile_cache_flusher(interval: float = 0.05):
+    """Flush dirty profiles back to their Redis hashes in pipelined batches"""
+    redis_client = app_state.get("redis")
+    while True:
+        await asyncio.sleep(interval)
+        if not dirty_profiles or not redis_client:
+            continue
+        batch = [
+            (user_id, user_profiles[user_id])
+            for user_id in dirty_profiles
+            if user_id in user_profiles
+        ]
+        dirty_profiles.clear()
+        if not batch:
+            continue
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for user_id, profile in batch:
+                pipe.hset(f"profile:{user_id}", mapping=_profile_mapping(profile))
+                pipe.sadd("profiles:index", user_id)
+            await pipe.execute()
 
 async def event_listener():
     """Background task to listen for profile component events"""
     subscriber = app_state["event_subscriber"]
     await subscriber.subscribe(["profile.component.ready", "module.started", "module.completed"])
     
-    async for event in subscriber.listen():
-        try:
-            if event.get("event_type") == "profile_component_ready":
-                await handle_profile_component(event)
-            elif event.get("event_type") == "module_started":
-                await handle_module_started(event)
-            elif event.get("event_type") == "module_completed":
-                await handle_module_completed(event)
-        except Exception as e:
-            print(f"Error handling event: {e}")
+    # Batches let handler I/O for a burst of events overlap in one gather
+    # instead of running serially, one await per event
+    async for batch in subscriber.listen_batches():
+        await asyncio.gather(*(dispatch_event(event) for event in batch))
+
+async def dispatch_event(event: Dict[str, Any]):
+    """Route an event to its handler: one dict lookup per event"""
+    handler = EVENT_HANDLERS.get(event.get("event_type"))
+    if handler is None:
+        return
+    try:
+        await handler(event)
+    except Exception as e:
+        print(f"Error handling event: {e}")
 
 async def handle_profile_component(event: Dict[str, Any]):
     """Handle incoming profile component from a service"""
@@ -59,28 +145,44 @@ async def handle_profile_component(event: Dict[str, Any]):
     if not user_id or not component_data:
         return
     
-    component = ProfileComponent(**component_data)
-    
+    # model_validate rather than model_construct: msgpack stringifies
+    # generated_at on the wire, so the datetime coercion here is load-bearing
+    component = ProfileComponent.model_validate(component_data)
+    now = datetime.utcnow()
+
     # Get or create user profile
-    if user_id not in user_profiles:
-        user_profiles[user_id] = AggregatedProfile(
+    profile = await _get_profile(user_id)
+    if profile is None:
+        profile = AggregatedProfile(
             user_id=user_id,
             components={},
-            last_updated=datetime.utcnow(),
+            last_updated=now,
             completion_status={}
         )
-    
+        _cache_profile(user_id, profile)
+
     # Add/update component
-    profile = user_profiles[user_id]
     profile.components[component.component_type] = component
-    profile.last_updated = datetime.utcnow()
+    profile.last_updated = now
     profile.completion_status[component.service_origin] = "completed"
-    
-    # Cache the updated profile
-    cache = app_state.get("cache")
-    if cache:
-        await cache.set(f"profile:{user_id}", profile.dict(), ttl=3600)
-    
+
+    # Mark for the batched flush; a burst of component events for many
+    # users becomes one pipelined write to their hashes
+    dirty_profiles.add(user_id)
+
+    # Tell downstream consumers the aggregate changed. Both this and the
+    # cache write above are already asynchronous behind queues (the
+    # publisher's drain task and the flusher), so each costs a queue put
+    # here rather than a Redis round-trip on the handler path.
+    publisher = app_state.get("event_publisher")
+    if publisher:
+        await publisher.publish("profile.updated", {
+            "event_type": "profile_updated",
+            "module": "user-profile-service",
+            "user_id": user_id,
+            "updated_fields": [component.component_type]
+        })
+
     print(f"Updated profile for user {user_id} with {component.component_type}")
 
 async def handle_module_started(event: Dict[str, Any]):
@@ -90,28 +192,56 @@ async def handle_module_started(event: Dict[str, Any]):
     
     if not user_id or not module:
         return
-    
-    if user_id not in module_progress:
-        module_progress[user_id] = {}
-    
-    module_progress[user_id][module] = ModuleProgress(
+
+    progress = ModuleProgress(
         user_id=user_id,
         module_name=module,
         status=ModuleStatus.IN_PROGRESS,
         progress_percentage=0,
         start_time=datetime.utcnow()
     )
+    await _store_progress(user_id, module, progress)
 
 async def handle_module_completed(event: Dict[str, Any]):
     """Handle module completed event"""
     user_id = event.get("user_id")
     module = event.get("module")
-    
-    if user_id in module_progress and module in module_progress[user_id]:
-        progress = module_progress[user_id][module]
+
+    if not user_id or not module:
+        return
+
+    raw = await app_state["redis"].hget(f"progress:{user_id}", module)
+    if raw:
+        progress = ModuleProgress(**orjson.loads(raw))
         progress.status = ModuleStatus.COMPLETED
         progress.progress_percentage = 100
         progress.end_time = datetime.utcnow()
+        await _store_progress(user_id, module, progress)
+
+async def _store_progress(user_id: str, module: str, progress: ModuleProgress):
+    """Write one module's progress into the user's progress hash.
+
+    A running percentage total rides along in the _pct_total field
+    (HINCRBYFLOAT by the delta), so the progress endpoint reads the overall
+    completion instead of recomputing it from every module on each poll.
+    """
+    redis_client = app_state["redis"]
+    key = f"progress:{user_id}"
+    old = await redis_client.hget(key, module)
+    old_pct = orjson.loads(old).get("progress_percentage", 0) if old else 0
+    delta = progress.progress_percentage - old_pct
+    async with redis_client.pipeline(transaction=False) as pipe:
+        pipe.hset(key, module, orjson.dumps(progress.dict()))
+        if delta:
+            pipe.hincrbyfloat(key, "_pct_total", delta)
+        await pipe.execute()
+
+# event_type -> handler, consulted once per event by dispatch_event
+EVENT_HANDLERS = {
+    "profile_component_ready": handle_profile_component,
+    "module_started": handle_module_started,
+    "module_completed": handle_module_completed,
+}
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -119,10 +249,13 @@ async def lifespan(app: FastAPI):
     redis_client = await get_redis_client()
     
     app_state["redis"] = redis_client
-    app_state["service_registry"] = ServiceRegistry(redis_client)
-    app_state["event_subscriber"] = EventSubscriber(redis_client)
+    app_state["service_registry"] = ServiceRegistry()
+    # One consumer group per service: replicas share the stream backlog
+    app_state["event_subscriber"] = EventSubscriber(group="user-profile-service")
     app_state["event_publisher"] = EventPublisher(redis_client)
-    app_state["cache"] = CacheManager(redis_client)
+    # Lifespan singleton: every handler shares the pooled HTTP client
+    # instead of constructing one per call
+    app_state["inter_service"] = InterServiceClient(app_state["service_registry"])
     
     # Register this service
     await app_state["service_registry"].register_service(
@@ -132,13 +265,16 @@ async def lifespan(app: FastAPI):
         "/health"
     )
     
-    # Start event listener in background
+    # Start event listener and cache flusher in background
     app_state["listener_task"] = asyncio.create_task(event_listener())
+    app_state["flusher_task"] = asyncio.create_task(profile_cache_flusher())
     
     yield
     
     # Shutdown
     app_state["listener_task"].cancel()
+    app_state["flusher_task"].cancel()
+    await app_state["inter_service"].close()
     await app_state["service_registry"].deregister_service("user-profile-service")
     await redis_client.close()
 
@@ -149,32 +285,34 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Orchestrators poll /health every few seconds; memoizing the count for a
+# second keeps those polls off Redis entirely
+_health = {"count": 0, "exp": 0.0}
+
 # Health check
-@app.get("/health")
+@app.get("/health", include_in_schema=False)
 async def health_check():
+    now = time.monotonic()
+    if now > _health["exp"]:
+        _health["count"] = await app_state["redis"].scard("profiles:index")
+        _health["exp"] = now + 1.0
     return {
         "status": "healthy",
         "service": "user-profile-service",
         "version": "1.0.0",
-        "profiles_cached": len(user_profiles)
+        "profiles_cached": _health["count"]
     }
 
 # Get aggregated profile
 @app.get("/profile/{user_id}/aggregate")
 async def get_aggregated_profile(user_id: str):
     """Get complete aggregated profile for a user"""
-    # Try cache first
-    cache = app_state.get("cache")
-    if cache:
-        cached = await cache.get(f"profile:{user_id}")
-        if cached:
-            return cached
-    
-    # Get from memory
-    if user_id in user_profiles:
-        profile = user_profiles[user_id]
-        return profile.dict()
-    
+    profile = await _get_profile(user_id)
+    if profile is not None:
+        # Rust-side serialization straight to bytes, skipping the
+        # dict() + jsonable_encoder round-trip
+        return Response(content=profile.model_dump_json(), media_type="application/json")
+
     return {
         "user_id": user_id,
         "components": {},
@@ -186,37 +324,39 @@ async def get_aggregated_profile(user_id: str):
 @app.get("/profile/{user_id}/component/{component_type}")
 async def get_profile_component(user_id: str, component_type: str):
     """Get specific profile component"""
-    if user_id in user_profiles:
-        profile = user_profiles[user_id]
-        if component_type in profile.components:
-            return profile.components[component_type].dict()
-    
+    profile = await _get_profile(user_id)
+    if profile is not None and component_type in profile.components:
+        return profile.components[component_type].dict()
+
     raise HTTPException(status_code=404, detail="Component not found")
 
 # Get user progress
 @app.get("/profile/{user_id}/progress")
 async def get_user_progress(user_id: str):
     """Get user's progress across all modules"""
-    progress_data = module_progress.get(user_id, {})
-    
-    # Add default progress for known modules
-    all_modules = ["compass", "skill-analyzer", "expertise-analyzer"]
+    # One HMGET for the fixed module list plus the maintained total:
+    # known-absent modules cost a nil in the same reply, and the overall
+    # completion is a single field read instead of a per-request recompute
+    values = await app_state["redis"].hmget(
+        f"progress:{user_id}", list(ALL_MODULES) + ["_pct_total"]
+    )
+    pct_total = values.pop()
+
     result = {}
-    
-    for module in all_modules:
-        if module in progress_data:
-            result[module] = progress_data[module].dict()
+    for module, raw in zip(ALL_MODULES, values):
+        if raw:
+            result[module] = orjson.loads(raw)
         else:
             result[module] = {
                 "module_name": module,
                 "status": "not_started",
                 "progress_percentage": 0
             }
-    
+
     return {
         "user_id": user_id,
         "modules": result,
-        "overall_completion": _calculate_overall_completion(result)
+        "overall_completion": float(pct_total or 0) / len(ALL_MODULES)
     }
 
 # Update progress manually (for modules that don't emit events)
@@ -227,10 +367,7 @@ async def update_module_progress(
     progress_data: Dict[str, Any]
 ):
     """Manually update module progress"""
-    if user_id not in module_progress:
-        module_progress[user_id] = {}
-    
-    module_progress[user_id][module_name] = ModuleProgress(
+    progress = ModuleProgress(
         user_id=user_id,
         module_name=module_name,
         status=progress_data.get("status", ModuleStatus.IN_PROGRESS),
@@ -239,38 +376,54 @@ async def update_module_progress(
         end_time=progress_data.get("end_time"),
         metadata=progress_data.get("metadata", {})
     )
-    
+    await _store_progress(user_id, module_name, progress)
+
     return {"message": "Progress updated", "module": module_name}
 
 # Get all users with profiles
 @app.get("/profiles/all")
 async def get_all_profiles():
-    """Get list of all users with profiles"""
-    return {
-        "total_users": len(user_profiles),
-        "users": [
-            {
-                "user_id": user_id,
-                "components": list(profile.components.keys()),
-                "last_updated": profile.last_updated
-            }
-            for user_id, profile in user_profiles.items()
-        ]
-    }
+    """Stream the user listing as NDJSON, one line per user.
 
-def _calculate_overall_completion(modules: Dict[str, Any]) -> float:
-    """Calculate overall completion percentage"""
-    if not modules:
-        return 0.0
-    
-    total = 0
-    for module_data in modules.values():
-        if isinstance(module_data, dict):
-            total += module_data.get("progress_percentage", 0)
-    
-    return total / len(modules) if modules else 0
+    Serializing the whole tenant population into one JSON document spikes
+    memory and blocks the event loop; streaming keeps the working set to one
+    chunk of rows, and the awaited Redis round-trip between chunks yields
+    the loop naturally.
+    """
+    redis_client = app_state["redis"]
+    user_ids = sorted(await redis_client.smembers("profiles:index"))
+
+    async def generate():
+        chunk_size = 500
+        for start in range(0, len(user_ids), chunk_size):
+            chunk = user_ids[start:start + chunk_size]
+            async with redis_client.pipeline(transaction=False) as pipe:
+                for user_id in chunk:
+                    pipe.hgetall(f"profile:{user_id}")
+                hashes = await pipe.execute()
+            for user_id, data in zip(chunk, hashes):
+                yield orjson.dumps({
+                    "user_id": user_id,
+                    "components": [
+                        field[len("component:"):]
+                        for field in data
+                        if field.startswith("component:")
+                    ],
+                    "last_updated": data.get("last_updated")
+                }) + b"\n"
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
 
 if __name__ == "__main__":
     import uvicorn
     port = int(os.getenv("PROFILE_PORT", "8002"))
-    uvicorn.run(app, host="0.0.0.0", port=port)
\ No newline at end of file
+    # Import string rather than the app object so workers>1 can fork; all
+    # profile state lives in Redis, so workers don't need shared memory
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=port,
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.getenv("UVICORN_WORKERS", "1"))
+    )
\ No newline at end of file
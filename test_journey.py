@@ -1,16 +1,27 @@
 #!/usr/bin/env python3
-import requests
-import json
-import time
+import asyncio
+import sys
+
+import httpx
 
 BASE_URL = "http://localhost:8000/api/v1/compass"
 
-def test_journey():
-    print("Starting journey test...")
-    
+# One pooled client for every simulated user: connections are reused across
+# requests instead of paying handshake cost per call
+client = httpx.AsyncClient(
+    base_url=BASE_URL,
+    timeout=30,
+    http2=True,
+    limits=httpx.Limits(max_keepalive_connections=20)
+)
+
+async def test_journey(user_index: int = 0):
+    tag = f"[user {user_index}]"
+    print(f"{tag} Starting journey test...")
+
     # 1. Start a journey
-    start_response = requests.post(f"{BASE_URL}/start", json={
-        "user_id": "test_user",
+    start_response = await client.post("/start", json={
+        "user_id": f"test_user_{user_index}",
         "demographics": {
             "age": 25,
             "education_level": "bachelor",
@@ -20,38 +31,38 @@ def test_journey():
             "question_style": "casual"
         }
     })
-    
+
     if start_response.status_code != 200:
-        print(f"Failed to start journey: {start_response.text}")
+        print(f"{tag} Failed to start journey: {start_response.text}")
         return
-    
+
     journey_data = start_response.json()
     journey_id = journey_data.get('journey_id')
-    print(f"✓ Journey started: {journey_id}")
-    
+    print(f"{tag} ✓ Journey started: {journey_id}")
+
     # 2. Get first question
-    question_response = requests.post(f"{BASE_URL}/journey/{journey_id}/next-question")
-    
+    question_response = await client.post(f"/journey/{journey_id}/next-question")
+
     if question_response.status_code != 200:
-        print(f"Failed to get question: {question_response.text}")
+        print(f"{tag} Failed to get question: {question_response.text}")
         return
-    
+
     question_data = question_response.json()
     question_id = question_data.get('question_id')
     has_options = 'options' in question_data and len(question_data['options']) > 0
-    
-    print(f"✓ Got question {question_id}")
-    print(f"  - Has options metadata: {has_options}")
-    
+
+    print(f"{tag} ✓ Got question {question_id}")
+    print(f"{tag}   - Has options metadata: {has_options}")
+
     if has_options:
         option = question_data['options'][0]
-        print(f"  - First option has RIASEC: {'riasec_weights' in option}")
-        print(f"  - First option has motivators: {'motivators' in option}")
-    
+        print(f"{tag}   - First option has RIASEC: {'riasec_weights' in option}")
+        print(f"{tag}   - First option has motivators: {'motivators' in option}")
+
     # 3. Submit response
-    print("\nSubmitting response...")
-    response_result = requests.post(
-        f"{BASE_URL}/journey/{journey_id}/response",
+    print(f"{tag} Submitting response...")
+    response_result = await client.post(
+        f"/journey/{journey_id}/response",
         json={
             "question_id": question_id,
             "response_text": "A",
@@ -59,27 +70,35 @@ def test_journey():
             "skipped": False
         }
     )
-    
-    print(f"Response status: {response_result.status_code}")
-    
+
+    print(f"{tag} Response status: {response_result.status_code}")
+
     if response_result.status_code == 200:
         decision = response_result.json()
-        print(f"✓ Response accepted")
-        print(f"  - Decision: {decision.get('decision', 'N/A')}")
-        print(f"  - Reasoning: {decision.get('reasoning', 'N/A')[:100]}...")
+        print(f"{tag} ✓ Response accepted")
+        print(f"{tag}   - Decision: {decision.get('decision', 'N/A')}")
+        print(f"{tag}   - Reasoning: {decision.get('reasoning', 'N/A')[:100]}...")
     else:
-        print(f"✗ Response failed: {response_result.text[:200]}")
-    
+        print(f"{tag} ✗ Response failed: {response_result.text[:200]}")
+
     # 4. Check journey state
-    state_response = requests.get(f"{BASE_URL}/journey/{journey_id}")
+    state_response = await client.get(f"/journey/{journey_id}")
     if state_response.status_code == 200:
         state = state_response.json()
-        print(f"\n✓ Journey state:")
-        print(f"  - Questions asked: {len(state.get('questions_asked', []))}")
-        print(f"  - Responses: {len(state.get('responses', []))}")
-        print(f"  - Status: {state.get('status')}")
+        print(f"{tag} ✓ Journey state:")
+        print(f"{tag}   - Questions asked: {len(state.get('questions_asked', []))}")
+        print(f"{tag}   - Responses: {len(state.get('responses', []))}")
+        print(f"{tag}   - Status: {state.get('status')}")
     else:
-        print(f"✗ Failed to get journey state")
+        print(f"{tag} ✗ Failed to get journey state")
+
+async def main(num_users: int):
+    # Concurrent users share the pooled client; gather overlaps their I/O
+    try:
+        await asyncio.gather(*[test_journey(i) for i in range(num_users)])
+    finally:
+        await client.aclose()
 
 if __name__ == "__main__":
-    test_journey()
\ No newline at end of file
+    num_users = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+    asyncio.run(main(num_users))